@@ -15,14 +15,19 @@ logger = logging.getLogger(__name__)
 # Configuration
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 API_URL = os.getenv("API_URL", "http://localhost:8000")
-ALLOWED_USERS = os.getenv("ALLOWED_TELEGRAM_USERS", "").split(",")
+
+
+def _allowed_users() -> set[str]:
+    """Allowed user ids, read from the environment on each check"""
+    return {user for user in os.getenv("ALLOWED_TELEGRAM_USERS", "").split(",") if user}
 
 
 def is_authorized(user_id: int) -> bool:
     """Check if user is authorized"""
-    if not ALLOWED_USERS or ALLOWED_USERS == [""]:
+    allowed_users = _allowed_users()
+    if not allowed_users:
         return True  # No restrictions if not configured
-    return str(user_id) in ALLOWED_USERS
+    return str(user_id) in allowed_users
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Migration: Add partial indexes for the expiry job
+
+This migration:
+1. Creates 'ix_bookmarks_expires_at' on bookmarks(expires_at) WHERE expires_at IS NOT NULL
+2. Creates 'ix_feed_items_published_at' on feed_items(published_at) WHERE published_at IS NOT NULL
+
+SQLite 3.8.0+ supports partial indexes.
+
+New databases get the index from create_all; this covers existing ones.
+"""
+import sqlite3
+import os
+import sys
+
+
+def get_db_path():
+    """Get the database path from environment or default"""
+    db_url = os.getenv("DATABASE_URL", "sqlite:///./data/bookmarks.db")
+    # Extract path from URL
+    if db_url.startswith("sqlite"):
+        path = db_url.split("///")[-1]
+        return path
+    return "./data/bookmarks.db"
+
+
+def migrate(db_path=None):
+    """Run the migration"""
+    if db_path is None:
+        db_path = get_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}, skipping migration")
+        return True
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        print("Creating ix_bookmarks_expires_at...")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_bookmarks_expires_at ON bookmarks (expires_at) "
+            "WHERE expires_at IS NOT NULL"
+        )
+        print("Creating ix_feed_items_published_at...")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_feed_items_published_at ON feed_items (published_at) "
+            "WHERE published_at IS NOT NULL"
+        )
+        conn.commit()
+        print("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Migration failed: {e}")
+        return False
+
+    finally:
+        conn.close()
+
+
+def rollback(db_path=None):
+    """Rollback the migration"""
+    if db_path is None:
+        db_path = get_db_path()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("DROP INDEX IF EXISTS ix_bookmarks_expires_at")
+        cursor.execute("DROP INDEX IF EXISTS ix_feed_items_published_at")
+        conn.commit()
+        print("Rollback completed")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Rollback failed: {e}")
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rollback":
+        db = sys.argv[2] if len(sys.argv) > 2 else None
+        rollback(db)
+    else:
+        db = sys.argv[1] if len(sys.argv) > 1 else None
+        migrate(db)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Migration: Add FTS5 full-text index for keyword search
+
+This migration:
+1. Creates the 'bookmarks_fts' FTS5 table over bookmarks(title, description, url)
+2. Creates insert/delete/update triggers that keep it in sync
+3. Rebuilds the index from the existing bookmarks
+
+Requires SQLite compiled with FTS5 (standard in Python's sqlite3).
+
+init_db runs the same DDL on every app startup; this lets it be applied by hand.
+"""
+import sqlite3
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database import BOOKMARKS_FTS_DDL  # noqa: E402
+
+
+def get_db_path():
+    """Get the database path from environment or default"""
+    db_url = os.getenv("DATABASE_URL", "sqlite:///./data/bookmarks.db")
+    # Extract path from URL
+    if db_url.startswith("sqlite"):
+        path = db_url.split("///")[-1]
+        return path
+    return "./data/bookmarks.db"
+
+
+def migrate(db_path=None):
+    """Run the migration"""
+    if db_path is None:
+        db_path = get_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}, skipping migration")
+        return True
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        print("Creating bookmarks_fts and triggers...")
+        for statement in BOOKMARKS_FTS_DDL:
+            cursor.execute(statement)
+        print("Indexing existing bookmarks...")
+        cursor.execute("INSERT INTO bookmarks_fts(bookmarks_fts) VALUES ('rebuild')")
+        conn.commit()
+        print("Migration completed successfully")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Migration failed: {e}")
+        return False
+
+    finally:
+        conn.close()
+
+
+def rollback(db_path=None):
+    """Rollback the migration"""
+    if db_path is None:
+        db_path = get_db_path()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        for trigger in ("bookmarks_fts_ai", "bookmarks_fts_ad", "bookmarks_fts_au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DROP TABLE IF EXISTS bookmarks_fts")
+        conn.commit()
+        print("Rollback completed")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Rollback failed: {e}")
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rollback":
+        db = sys.argv[2] if len(sys.argv) > 2 else None
+        rollback(db)
+    else:
+        db = sys.argv[1] if len(sys.argv) > 1 else None
+        migrate(db)
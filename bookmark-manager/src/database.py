@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import StaticPool
@@ -10,6 +11,39 @@ class Base(DeclarativeBase):
 engine = None
 async_session_maker = None
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+)
+
+# FTS5 index for keyword search; external content, kept in sync by triggers.
+# Created by init_db on every startup, so existing databases pick it up too
+BOOKMARKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5("
+    "title, description, url, content='bookmarks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ai AFTER INSERT ON bookmarks BEGIN "
+    "INSERT INTO bookmarks_fts(rowid, title, description, url) "
+    "VALUES (new.id, new.title, new.description, new.url); END",
+    "CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ad AFTER DELETE ON bookmarks BEGIN "
+    "INSERT INTO bookmarks_fts(bookmarks_fts, rowid, title, description, url) "
+    "VALUES ('delete', old.id, old.title, old.description, old.url); END",
+    "CREATE TRIGGER IF NOT EXISTS bookmarks_fts_au AFTER UPDATE OF title, description, url ON bookmarks BEGIN "
+    "INSERT INTO bookmarks_fts(bookmarks_fts, rowid, title, description, url) "
+    "VALUES ('delete', old.id, old.title, old.description, old.url); "
+    "INSERT INTO bookmarks_fts(rowid, title, description, url) "
+    "VALUES (new.id, new.title, new.description, new.url); END",
+)
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """WAL lets readers proceed while expiry/backup write"""
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 async def init_db(database_url: str = None) -> None:
     global engine, async_session_maker
 
@@ -32,6 +66,8 @@ async def init_db(database_url: str = None) -> None:
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
 
     async_session_maker = async_sessionmaker(
         engine,
@@ -44,6 +80,18 @@ async def init_db(database_url: str = None) -> None:
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            await _ensure_bookmarks_fts(conn)
+
+async def _ensure_bookmarks_fts(conn) -> None:
+    """Create the FTS index if missing and fill it from existing bookmarks"""
+    exists = (await conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = 'bookmarks_fts'"
+    )).first()
+    for statement in BOOKMARKS_FTS_DDL:
+        await conn.exec_driver_sql(statement)
+    if exists is None:
+        await conn.exec_driver_sql("INSERT INTO bookmarks_fts(bookmarks_fts) VALUES ('rebuild')")
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 from src.services.background_jobs import BackgroundJobService
+from src.services.zotero_service import close_zotero_client
 from src.routers import bookmarks, search, backup, ui, feeds, canvas
 from src.scheduler import start_scheduler, stop_scheduler
 from src.utils.paths import find_shared_dir
@@ -40,6 +41,10 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     stop_scheduler()
+    await canvas.close_canvas_client()
+    await background_job_service.aclose()
+    await feeds.feed_service.aclose()
+    await close_zotero_client()
 
 @app.get("/health")
 async def health_check():
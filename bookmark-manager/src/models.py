@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, Text, ForeignKey, UniqueConstraint, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, Text, ForeignKey, UniqueConstraint, Boolean, Index
+from sqlalchemy.sql import func, text
 import enum
 from src.database import Base
 
@@ -27,6 +27,13 @@ class Bookmark(Base):
     zotero_key = Column(String, nullable=True)
     expires_at = Column(DateTime, nullable=True)  # NULL = never expires
 
+    __table_args__ = (
+        # Keyset pagination in list_bookmarks orders by (added_at, id)
+        Index('ix_bookmarks_added_at_id', 'added_at', 'id'),
+        # Expiry job only looks at rows that can expire
+        Index('ix_bookmarks_expires_at', 'expires_at', sqlite_where=text('expires_at IS NOT NULL')),
+    )
+
 class Feed(Base):
     __tablename__ = "feeds"
 
@@ -52,6 +59,8 @@ class FeedItem(Base):
 
     __table_args__ = (
         UniqueConstraint('feed_id', 'guid', name='uq_feed_item_guid'),
+        # Expiry job and feed views filter on published_at
+        Index('ix_feed_items_published_at', 'published_at', sqlite_where=text('published_at IS NOT NULL')),
     )
 
 
@@ -64,3 +73,13 @@ class Event(Base):
     event_type = Column(String, nullable=False)  # 'funnel' or 'feature'
     name = Column(String, nullable=False, index=True)
     event_metadata = Column("metadata", Text, nullable=True)  # JSON string
+
+
+class ZoteroSync(Base):
+    """Papers already pushed to Zotero, so repeat syncs reuse the item."""
+    __tablename__ = "zotero_sync"
+
+    dedup_key = Column(String, primary_key=True)  # "doi:<doi>" or "url:<url>"
+    zotero_key = Column(String, nullable=False)
+    needs_manual = Column(Boolean, default=False, nullable=False)
+    synced_at = Column(DateTime, default=func.now(), nullable=False)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, case, null, literal, and_, or_
 from src.database import get_db
 from src.models import Bookmark, BookmarkState
-from src.schemas import BookmarkCreate, BookmarkUpdate, BookmarkDescriptionUpdate, BookmarkTitleUpdate, BookmarkTimestampUpdate, BookmarkResponse, BookmarkContentResponse, BookmarkPinUpdate, BookmarkThesisUpdate, BookmarkExportResponse
+from src.schemas import BookmarkCreate, BookmarkUpdate, BookmarkDescriptionUpdate, BookmarkTitleUpdate, BookmarkTimestampUpdate, BookmarkResponse, BookmarkContentResponse, BookmarkPinUpdate, BookmarkThesisUpdate, BookmarkExportResponse, BookmarkListAdapter
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from urllib.parse import urlencode
 import re
 
 
@@ -16,6 +18,66 @@ def calculate_expiry(pinned: bool, is_thesis: bool) -> Optional[datetime]:
     return datetime.utcnow() + timedelta(days=7)
 
 
+def expiry_on_toggle(protected: bool, other_flag):
+    """SQL value for expires_at when one protection flag (pinned/thesis) changes.
+
+    The other flag is read inside the UPDATE itself, so no prior SELECT is needed.
+    """
+    if protected:
+        return None
+    return case((other_flag == True, null()), else_=calculate_expiry(pinned=False, is_thesis=False))
+
+
+def sqlite_timestamp(value: datetime) -> str:
+    """Render a datetime the way SQLite stores added_at.
+
+    CURRENT_TIMESTAMP rows have no fractional seconds, rows written from
+    Python datetimes carry ".ffffff", so keyset comparisons must bind the
+    cursor in the same form to compare exactly. Aware values are taken
+    as UTC, which is what the stored naive values are.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    text = value.strftime("%Y-%m-%d %H:%M:%S")
+    if value.microsecond:
+        text += f".{value.microsecond:06d}"
+    return text
+
+
+def added_before(added_at: datetime, before_id: int):
+    """Keyset predicate for (added_at, id) < (added_at, before_id).
+
+    A whole-second cursor can match either stored form of the same time.
+    """
+    timestamp = sqlite_timestamp(added_at)
+    same_time = [timestamp] if "." in timestamp else [timestamp, f"{timestamp}.000000"]
+    return or_(
+        Bookmark.added_at < literal(timestamp),
+        and_(Bookmark.added_at.in_([literal(t) for t in same_time]), Bookmark.id < before_id),
+    )
+
+
+async def update_bookmark_returning(
+    session: AsyncSession,
+    bookmark_id: int,
+    values: dict,
+    *criteria
+) -> Optional[Bookmark]:
+    """Apply an UPDATE ... RETURNING in one round trip. Returns None if no row matched."""
+    stmt = (
+        update(Bookmark)
+        .where(Bookmark.id == bookmark_id, *criteria)
+        .values(**values)
+        .returning(Bookmark)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    bookmark = result.scalar_one_or_none()
+    await session.commit()
+    return bookmark
+
+
+@lru_cache(maxsize=4096)
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from URL.
 
@@ -45,9 +107,11 @@ async def create_bookmark(
     # Import here to avoid circular import
     from src.main import background_job_service
 
+    url_str = str(bookmark_data.url)
+
     # Check for duplicate
     result = await session.execute(
-        select(Bookmark).where(Bookmark.url == str(bookmark_data.url))
+        select(Bookmark).where(Bookmark.url == url_str)
     )
     existing = result.scalar_one_or_none()
 
@@ -58,7 +122,6 @@ async def create_bookmark(
         )
 
     # Detect YouTube video
-    url_str = str(bookmark_data.url)
     video_id = extract_video_id(url_str)
 
     # Detect academic paper -> thesis
@@ -97,9 +160,15 @@ async def list_bookmarks(
     pinned: Optional[bool] = None,
     limit: int = 100,
     offset: int = 0,
+    before_added_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     session: AsyncSession = Depends(get_db)
 ):
-    """List bookmarks with optional filters"""
+    """List bookmarks with optional filters.
+
+    Pass before_added_at/before_id (from the X-Next-Cursor header) for keyset
+    pagination instead of offset; offset is ignored when a cursor is given.
+    """
     query = select(Bookmark)
 
     # View-based filtering (mutually exclusive with individual filters)
@@ -146,12 +215,36 @@ async def list_bookmarks(
         if pinned is not None:
             query = query.where(Bookmark.pinned == pinned)
 
-    query = query.order_by(Bookmark.added_at.desc()).limit(limit).offset(offset)
+    if (before_added_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before_added_at and before_id must be given together"
+        )
+    if before_added_at is not None:
+        # The cursor already marks the page start; an offset would skip rows
+        query = query.where(added_before(before_added_at, before_id))
+        offset = 0
+
+    query = query.order_by(Bookmark.added_at.desc(), Bookmark.id.desc()).limit(limit).offset(offset)
 
     result = await session.execute(query)
     bookmarks = result.scalars().all()
 
-    return bookmarks
+    headers = {}
+    if len(bookmarks) == limit:
+        last = bookmarks[-1]
+        headers["X-Next-Cursor"] = urlencode({
+            "before_added_at": last.added_at.isoformat(),
+            "before_id": last.id,
+        })
+
+    return Response(
+        content=BookmarkListAdapter.dump_json(
+            [BookmarkResponse.from_orm_fast(b) for b in bookmarks]
+        ),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.get("/recently-archived", response_model=list[BookmarkResponse])
@@ -217,7 +310,15 @@ async def update_bookmark(
     session: AsyncSession = Depends(get_db)
 ):
     """Update bookmark (mark as read/inbox)"""
-    bookmark = await session.get(Bookmark, bookmark_id)
+    if not update_data.state:
+        bookmark = await session.get(Bookmark, bookmark_id)
+    else:
+        read_at = datetime.utcnow() if update_data.state == "read" else None
+        bookmark = await update_bookmark_returning(
+            session,
+            bookmark_id,
+            {"state": BookmarkState(update_data.state), "read_at": read_at}
+        )
 
     if not bookmark:
         raise HTTPException(
@@ -225,24 +326,13 @@ async def update_bookmark(
             detail="Bookmark not found"
         )
 
-    if update_data.state:
-        bookmark.state = BookmarkState(update_data.state)
-        if update_data.state == "read":
-            from datetime import datetime
-            bookmark.read_at = datetime.utcnow()
-
-            # Trigger Zotero sync for thesis papers
-            if bookmark.is_thesis and not bookmark.zotero_key:
-                background_tasks.add_task(
-                    sync_paper_to_zotero,
-                    bookmark.id,
-                    session
-                )
-        else:
-            bookmark.read_at = None
-
-    await session.commit()
-    await session.refresh(bookmark)
+    # Trigger Zotero sync for thesis papers
+    if update_data.state == "read" and bookmark.is_thesis and not bookmark.zotero_key:
+        background_tasks.add_task(
+            sync_paper_to_zotero,
+            bookmark.id,
+            session
+        )
 
     return bookmark
 
@@ -252,10 +342,10 @@ async def update_bookmark_description(
     update_data: BookmarkDescriptionUpdate,
     session: AsyncSession = Depends(get_db)
 ):
-    """Update bookmark description and regenerate embedding"""
-    from src.main import background_job_service
-
-    bookmark = await session.get(Bookmark, bookmark_id)
+    """Update bookmark description"""
+    bookmark = await update_bookmark_returning(
+        session, bookmark_id, {"description": update_data.description}
+    )
 
     if not bookmark:
         raise HTTPException(
@@ -263,20 +353,6 @@ async def update_bookmark_description(
             detail="Bookmark not found"
         )
 
-    # Update description
-    bookmark.description = update_data.description
-
-    # Regenerate embedding
-    embedding_service = background_job_service._get_embedding_service()
-    search_text = f"{bookmark.title or ''} {bookmark.description or ''}".strip()
-
-    if search_text:
-        embedding = embedding_service.generate_embedding(search_text)
-        bookmark.embedding = embedding
-
-    await session.commit()
-    await session.refresh(bookmark)
-
     return bookmark
 
 @router.patch("/{bookmark_id}/title", response_model=BookmarkResponse)
@@ -286,7 +362,9 @@ async def update_bookmark_title(
     session: AsyncSession = Depends(get_db)
 ):
     """Update bookmark title"""
-    bookmark = await session.get(Bookmark, bookmark_id)
+    bookmark = await update_bookmark_returning(
+        session, bookmark_id, {"title": update_data.title}
+    )
 
     if not bookmark:
         raise HTTPException(
@@ -294,10 +372,6 @@ async def update_bookmark_title(
             detail="Bookmark not found"
         )
 
-    bookmark.title = update_data.title
-    await session.commit()
-    await session.refresh(bookmark)
-
     return bookmark
 
 @router.patch("/{bookmark_id}/timestamp", response_model=BookmarkResponse)
@@ -307,24 +381,25 @@ async def update_bookmark_timestamp(
     session: AsyncSession = Depends(get_db)
 ):
     """Update video timestamp for resume playback"""
-    bookmark = await session.get(Bookmark, bookmark_id)
+    bookmark = await update_bookmark_returning(
+        session,
+        bookmark_id,
+        {"video_timestamp": update_data.timestamp},
+        Bookmark.video_id.isnot(None)
+    )
 
     if not bookmark:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bookmark not found"
-        )
-
-    if not bookmark.video_id:
+        # Only the failure path pays for a lookup to pick the right error
+        if not await session.get(Bookmark, bookmark_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Bookmark not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bookmark is not a video"
         )
 
-    bookmark.video_timestamp = update_data.timestamp
-    await session.commit()
-    await session.refresh(bookmark)
-
     return bookmark
 
 
@@ -345,7 +420,7 @@ async def retry_scrape(
         )
 
     async def event_stream():
-        async for progress in background_job_service.process_bookmark_with_progress(bookmark_id, session):
+        async for progress in background_job_service.process_bookmark_with_progress(bookmark_id):
             yield f"data: {progress}\n\n"
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -358,16 +433,18 @@ async def toggle_pin(
     session: AsyncSession = Depends(get_db)
 ):
     """Toggle bookmark pinned status"""
-    bookmark = await session.get(Bookmark, bookmark_id)
+    bookmark = await update_bookmark_returning(
+        session,
+        bookmark_id,
+        {
+            "pinned": update_data.pinned,
+            # Recalculate expiry
+            "expires_at": expiry_on_toggle(update_data.pinned, Bookmark.is_thesis),
+        }
+    )
     if not bookmark:
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
-    bookmark.pinned = update_data.pinned
-    # Recalculate expiry
-    bookmark.expires_at = calculate_expiry(bookmark.pinned, bookmark.is_thesis)
-
-    await session.commit()
-    await session.refresh(bookmark)
     return bookmark
 
 
@@ -378,16 +455,18 @@ async def toggle_thesis(
     session: AsyncSession = Depends(get_db)
 ):
     """Toggle bookmark thesis status"""
-    bookmark = await session.get(Bookmark, bookmark_id)
+    bookmark = await update_bookmark_returning(
+        session,
+        bookmark_id,
+        {
+            "is_thesis": update_data.is_thesis,
+            # Recalculate expiry
+            "expires_at": expiry_on_toggle(update_data.is_thesis, Bookmark.pinned),
+        }
+    )
     if not bookmark:
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
-    bookmark.is_thesis = update_data.is_thesis
-    # Recalculate expiry
-    bookmark.expires_at = calculate_expiry(bookmark.pinned, bookmark.is_thesis)
-
-    await session.commit()
-    await session.refresh(bookmark)
     return bookmark
 
 
@@ -461,7 +540,8 @@ async def sync_paper_to_zotero(bookmark_id: int, session: AsyncSession):
     result = await zotero.sync_paper(
         url=bookmark.url,
         title=bookmark.title or "Untitled",
-        doi=doi
+        doi=doi,
+        session=session
     )
 
     if result.get("zotero_key"):
@@ -10,6 +10,28 @@ router = APIRouter(prefix="/canvas", tags=["canvas"])
 
 CANVAS_API_URL = os.getenv("CANVAS_API_URL", "http://canvas:8000/api/quotes")
 
+# Shared client so quote pushes reuse keep-alive connections to Canvas
+_canvas_client: httpx.AsyncClient | None = None
+
+
+def _get_canvas_client() -> httpx.AsyncClient:
+    """Return the shared Canvas client, creating it on first use"""
+    global _canvas_client
+    if _canvas_client is None or _canvas_client.is_closed:
+        _canvas_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return _canvas_client
+
+
+async def close_canvas_client() -> None:
+    """Close the shared Canvas client (called on app shutdown)"""
+    global _canvas_client
+    if _canvas_client is not None:
+        await _canvas_client.aclose()
+        _canvas_client = None
+
 
 @router.post("/quotes", response_model=CanvasQuoteResponse)
 async def push_quote_to_canvas(
@@ -25,29 +47,33 @@ async def push_quote_to_canvas(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bookmark not found"
         )
+    source_url = bookmark.url
+    source_title = bookmark.title or "Untitled"
+
+    # Release the connection before calling Canvas
+    await session.close()
 
     # Push to Canvas
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                CANVAS_API_URL,
-                json={
-                    "text": data.quote,
-                    "source_url": bookmark.url,
-                    "source_title": bookmark.title or "Untitled"
-                },
-                timeout=10.0
-            )
-            response.raise_for_status()
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Canvas service unavailable: {str(e)}"
-            )
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Canvas error: {e.response.text}"
-            )
+    client = _get_canvas_client()
+    try:
+        response = await client.post(
+            CANVAS_API_URL,
+            json={
+                "text": data.quote,
+                "source_url": source_url,
+                "source_title": source_title
+            }
+        )
+        response.raise_for_status()
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Canvas service unavailable: {str(e)}"
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Canvas error: {e.response.text}"
+        )
 
     return CanvasQuoteResponse(success=True, message="Quote sent to Canvas")
@@ -1,13 +1,15 @@
 # src/routers/feeds.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.sqlite import insert
 from datetime import datetime, timedelta
+from itertools import groupby
 from src.database import get_db
 from src.models import Feed, FeedItem, Bookmark, BookmarkState
 from src.schemas import (
     FeedCreate, FeedUpdate, FeedResponse, FeedWithItemsResponse, FeedItemResponse,
-    BookmarkResponse
+    FeedItemBatchSave, BookmarkResponse, FeedListAdapter
 )
 from src.services.feed_service import FeedService
 from typing import List
@@ -16,6 +18,35 @@ router = APIRouter(prefix="/feeds", tags=["feeds"])
 feed_service = FeedService()
 
 
+async def promote_feed_items(session: AsyncSession, items: List[FeedItem]) -> List[Bookmark]:
+    """Insert bookmarks for feed items, reusing existing ones by URL"""
+    values = {
+        item.url: {
+            "url": item.url,
+            "title": item.title,
+            "description": item.description,
+            "state": BookmarkState.inbox,
+        }
+        for item in items
+    }
+    stmt = (
+        insert(Bookmark)
+        .values(list(values.values()))
+        .on_conflict_do_nothing(index_elements=["url"])
+        .returning(Bookmark)
+    )
+    bookmarks = {b.url: b for b in (await session.scalars(stmt)).all()}
+
+    # Conflicting rows are not returned; fetch the existing bookmarks
+    missing = [url for url in values if url not in bookmarks]
+    if missing:
+        result = await session.scalars(select(Bookmark).where(Bookmark.url.in_(missing)))
+        bookmarks.update({b.url: b for b in result.all()})
+
+    await session.commit()
+    return [bookmarks[item.url] for item in items]
+
+
 @router.post("", response_model=FeedResponse, status_code=status.HTTP_201_CREATED)
 async def create_feed(
     feed_data: FeedCreate,
@@ -66,21 +97,20 @@ async def list_feeds(
     # Get items from last 24 hours only
     cutoff = datetime.utcnow() - timedelta(hours=24)
 
+    # One LEFT JOIN for all feeds; rows arrive grouped by feed
     result = await session.execute(
-        select(Feed).order_by(Feed.title)
+        select(Feed, FeedItem)
+        .outerjoin(FeedItem, and_(FeedItem.feed_id == Feed.id, FeedItem.published_at >= cutoff))
+        .order_by(
+            Feed.title, Feed.id,
+            FeedItem.published_at.desc().nullslast(), FeedItem.fetched_at.desc()
+        )
     )
-    feeds = result.scalars().all()
 
     response = []
-    for feed in feeds:
-        items_result = await session.execute(
-            select(FeedItem)
-            .where(FeedItem.feed_id == feed.id)
-            .where(FeedItem.published_at >= cutoff)
-            .order_by(FeedItem.published_at.desc().nullslast(), FeedItem.fetched_at.desc())
-        )
-        items = items_result.scalars().all()
-
+    for _, rows in groupby(result.all(), key=lambda row: row[0].id):
+        rows = list(rows)
+        feed = rows[0][0]
         response.append(FeedWithItemsResponse(
             id=feed.id,
             url=feed.url,
@@ -88,10 +118,10 @@ async def list_feeds(
             last_fetched_at=feed.last_fetched_at,
             error_count=feed.error_count,
             created_at=feed.created_at,
-            items=[FeedItemResponse.model_validate(item) for item in items]
+            items=[FeedItemResponse.from_orm_fast(item) for _, item in rows if item is not None]
         ))
 
-    return response
+    return Response(content=FeedListAdapter.dump_json(response), media_type="application/json")
 
 
 @router.patch("/{feed_id}", response_model=FeedResponse)
@@ -110,7 +140,6 @@ async def update_feed(
 
     feed.title = update_data.title
     await session.commit()
-    await session.refresh(feed)
     return feed
 
 
@@ -145,26 +174,32 @@ async def save_feed_item(
             detail="Feed item not found"
         )
 
-    # Check if bookmark already exists
+    bookmarks = await promote_feed_items(session, [item])
+    return bookmarks[0]
+
+
+@router.post("/{feed_id}/items/save-batch", response_model=List[BookmarkResponse])
+async def save_feed_items(
+    feed_id: int,
+    batch: FeedItemBatchSave,
+    session: AsyncSession = Depends(get_db)
+):
+    """Promote several feed items to bookmarks"""
     result = await session.execute(
-        select(Bookmark).where(Bookmark.url == item.url)
-    )
-    existing = result.scalar_one_or_none()
-    if existing:
-        return existing
-
-    # Create bookmark
-    bookmark = Bookmark(
-        url=item.url,
-        title=item.title,
-        description=item.description,
-        state=BookmarkState.inbox
+        select(FeedItem)
+        .where(FeedItem.feed_id == feed_id)
+        .where(FeedItem.id.in_(batch.item_ids))
     )
-    session.add(bookmark)
-    await session.commit()
-    await session.refresh(bookmark)
+    items = {item.id: item for item in result.scalars().all()}
+    if len(items) != len(set(batch.item_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Feed item not found"
+        )
+    if not items:
+        return []
 
-    return bookmark
+    return await promote_feed_items(session, [items[item_id] for item_id in dict.fromkeys(batch.item_ids)])
 
 
 @router.delete("/{feed_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -201,5 +236,4 @@ async def refresh_feed(
     # Reset error count to allow retry
     feed.error_count = 0
     await feed_service.refresh_feed(feed, session)
-    await session.refresh(feed)
     return feed
@@ -21,4 +21,4 @@ async def keyword_search(
         limit=search_data.limit
     )
 
-    return [BookmarkResponse.model_validate(b) for b in results]
+    return [BookmarkResponse.from_orm_fast(b) for b in results]
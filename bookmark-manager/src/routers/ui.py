@@ -3,13 +3,18 @@ from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
+from sqlalchemy.orm import load_only
 from datetime import datetime, timedelta
 from typing import Optional
 from src.database import get_db
 from src.models import Bookmark, BookmarkState, Feed, FeedItem
 from pathlib import Path
 from urllib.parse import urlparse
+from functools import lru_cache
+from collections import OrderedDict
+from markupsafe import Markup
+import asyncio
 import os
 from src.utils.paths import find_shared_dir
 from src.utils.sanitize import safe_html
@@ -24,6 +29,7 @@ shared_templates_dir = find_shared_dir(Path(__file__)) / "templates"
 templates = Jinja2Templates(directory=[str(templates_dir), str(shared_templates_dir)])
 
 
+@lru_cache(maxsize=4096)
 def domain_filter(url: str) -> str:
     """Extract domain from URL"""
     try:
@@ -37,25 +43,99 @@ templates.env.filters["domain"] = domain_filter
 templates.env.filters["safe_html"] = safe_html
 
 
-def expiry_filter(expires_at: datetime) -> str:
+def expiry_filter(expires_at: datetime, now: datetime = None) -> str:
     """Format expiry as '5d left' or 'expires today'"""
     if expires_at is None:
         return ""
-    now = datetime.utcnow()
+    if now is None:
+        now = datetime.utcnow()
     delta = expires_at - now
     days = delta.days
     if days > 1:
         return f"{days}d left"
     elif days == 1:
         return "1d left"
-    elif delta.total_seconds() > 0:
-        hours = int(delta.total_seconds() // 3600)
+    seconds = delta.total_seconds()
+    if seconds > 0:
+        hours = int(seconds // 3600)
         return f"{hours}h left" if hours > 0 else "expires soon"
     return "expired"
 
 
+def expiry_labels(bookmarks) -> dict:
+    """Expiry labels keyed by bookmark id, computed against a single 'now'"""
+    now = datetime.utcnow()
+    return {b.id: expiry_filter(b.expires_at, now) for b in bookmarks}
+
+
 templates.env.filters["expiry"] = expiry_filter
 
+# Columns the bookmark list templates actually render; skips the large `content` column
+BOOKMARK_LIST_COLUMNS = (
+    Bookmark.id,
+    Bookmark.url,
+    Bookmark.title,
+    Bookmark.description,
+    Bookmark.video_id,
+    Bookmark.video_timestamp,
+    Bookmark.pinned,
+    Bookmark.is_thesis,
+    Bookmark.expires_at,
+)
+
+
+# Rendered feed sections, keyed by feed fields plus (item count, max item id).
+# Items are only ever inserted (higher ids) or deleted, so any change to a
+# feed's visible items changes its key.
+FEED_SECTION_CACHE_SIZE = 256
+_feed_section_cache: OrderedDict = OrderedDict()
+
+
+async def render_feed_sections(session: AsyncSession, feeds, cutoff: datetime) -> list:
+    """Render one HTML section per feed, loading items only for cache misses"""
+    stats_result = await session.execute(
+        select(FeedItem.feed_id, func.count(), func.max(FeedItem.id))
+        .where(FeedItem.published_at >= cutoff)
+        .group_by(FeedItem.feed_id)
+    )
+    stats = {feed_id: (count, max_id) for feed_id, count, max_id in stats_result.all()}
+
+    keys = {
+        feed.id: (feed.id, feed.url, feed.title, feed.last_fetched_at, *stats.get(feed.id, (0, None)))
+        for feed in feeds
+    }
+    missing = [feed for feed in feeds if keys[feed.id] not in _feed_section_cache]
+
+    if missing:
+        items_by_feed = {feed.id: [] for feed in missing}
+        items_result = await session.execute(
+            select(FeedItem)
+            .where(FeedItem.feed_id.in_(items_by_feed))
+            .where(FeedItem.published_at >= cutoff)
+            .order_by(FeedItem.published_at.desc().nullslast(), FeedItem.fetched_at.desc())
+        )
+        for item in items_result.scalars().all():
+            items_by_feed[item.feed_id].append(item)
+
+        section_template = templates.get_template("_feed_section.html")
+        for feed in missing:
+            html = section_template.render(feed={
+                "id": feed.id,
+                "url": feed.url,
+                "title": feed.title,
+                "feed_items": items_by_feed[feed.id]
+            })
+            _feed_section_cache[keys[feed.id]] = Markup(html)
+
+    sections = []
+    for feed in feeds:
+        _feed_section_cache.move_to_end(keys[feed.id])
+        sections.append(_feed_section_cache[keys[feed.id]])
+    while len(_feed_section_cache) > FEED_SECTION_CACHE_SIZE:
+        _feed_section_cache.popitem(last=False)
+
+    return sections
+
 
 @router.get("/", response_class=HTMLResponse)
 async def ui_index(
@@ -71,25 +151,9 @@ async def ui_index(
         cutoff = datetime.utcnow() - timedelta(days=7)  # Changed from 24h to 7 days
         result = await session.execute(select(Feed).order_by(Feed.title))
         feeds_list = result.scalars().all()
+        feed_sections = await render_feed_sections(session, feeds_list, cutoff)
 
-        feeds_with_items = []
-        for feed in feeds_list:
-            items_result = await session.execute(
-                select(FeedItem)
-                .where(FeedItem.feed_id == feed.id)
-                .where(FeedItem.published_at >= cutoff)
-                .order_by(FeedItem.published_at.desc().nullslast(), FeedItem.fetched_at.desc())
-            )
-            items = items_result.scalars().all()
-            feeds_with_items.append({
-                "id": feed.id,
-                "url": feed.url,
-                "title": feed.title,
-                "error_count": feed.error_count,
-                "feed_items": items
-            })
-
-        context = {"request": request, "feeds": feeds_with_items, "view": view, "base_path": BASE_PATH}
+        context = {"request": request, "feed_sections": feed_sections, "view": view, "base_path": BASE_PATH}
 
         # htmx request → return partial
         if request.headers.get("HX-Request"):
@@ -98,7 +162,7 @@ async def ui_index(
         return templates.TemplateResponse("feeds.html", context)
 
     # Build query based on view
-    query = select(Bookmark)
+    query = select(Bookmark).options(load_only(*BOOKMARK_LIST_COLUMNS))
 
     if view == "inbox":
         # Regular inbox: not thesis, not pinned
@@ -128,19 +192,30 @@ async def ui_index(
         query = query.order_by(Bookmark.added_at.desc()).limit(100)
     result = await session.execute(query)
     bookmarks = result.scalars().all()
+    current_description = None
+    if bookmarks:
+        current = bookmarks[0]
+        # Only the current item checks `content` (retry button)
+        await session.refresh(current, ["content"])
+        if not current.video_id:
+            # bleach parsing is CPU-bound; keep it off the event loop
+            current_description = await asyncio.to_thread(
+                safe_html, current.description or "No description"
+            )
 
     # Get counts for display
-    inbox_query = select(Bookmark).where(
+    inbox_query = select(func.count()).select_from(Bookmark).where(
         Bookmark.state == BookmarkState.inbox,
         Bookmark.is_thesis == False,
         Bookmark.pinned == False
     )
-    inbox_result = await session.execute(inbox_query)
-    inbox_count = len(inbox_result.scalars().all())
+    inbox_count = (await session.execute(inbox_query)).scalar_one()
 
     context = {
         "request": request,
         "bookmarks": bookmarks,
+        "expiry_labels": expiry_labels(bookmarks),
+        "current_description": current_description,
         "view": view,
         "query": q,
         "filter": filter,
@@ -17,11 +17,12 @@ async def run_expiry_jobs():
         if database.async_session_maker is None:
             logger.warning("Database not initialized, skipping expiry check")
             return
-        async with database.async_session_maker() as session:
-            bookmark_count = await expire_old_bookmarks(session)
-            feed_count = await expire_old_feed_items(session)
-            if bookmark_count > 0 or feed_count > 0:
-                logger.info(f"Expiry job: {bookmark_count} bookmarks, {feed_count} feed items deleted")
+        # Both deletes share one transaction and a single commit
+        async with database.async_session_maker() as session, session.begin():
+            bookmark_count = await expire_old_bookmarks(session, commit=False)
+            feed_count = await expire_old_feed_items(session, commit=False)
+        if bookmark_count > 0 or feed_count > 0:
+            logger.info(f"Expiry job: {bookmark_count} bookmarks, {feed_count} feed items deleted")
     except Exception as e:
         logger.error(f"Error running expiry jobs: {e}")
 
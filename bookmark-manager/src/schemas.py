@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, ConfigDict
+from pydantic import BaseModel, HttpUrl, ConfigDict, TypeAdapter
 from datetime import datetime
 from typing import Optional, Literal
 
@@ -32,6 +32,14 @@ class BookmarkResponse(BaseModel):
     zotero_key: Optional[str] = None
     expires_at: Optional[datetime] = None  # Added
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "BookmarkResponse":
+        """Build from a Bookmark row without validation.
+
+        Only safe because the values come straight from our own database.
+        """
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+
 
 class BookmarkTimestampUpdate(BaseModel):
     timestamp: int  # seconds
@@ -60,6 +68,10 @@ class FeedUpdate(BaseModel):
     title: str
 
 
+class FeedItemBatchSave(BaseModel):
+    item_ids: list[int]
+
+
 class FeedItemResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -72,6 +84,11 @@ class FeedItemResponse(BaseModel):
     published_at: Optional[datetime]
     fetched_at: datetime
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "FeedItemResponse":
+        """Build from a FeedItem row without validation (trusted DB data)"""
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+
 
 class FeedResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -123,3 +140,9 @@ class CanvasQuoteCreate(BaseModel):
 class CanvasQuoteResponse(BaseModel):
     success: bool
     message: str
+
+
+# List endpoints serialize straight to JSON bytes in pydantic-core instead of
+# going through FastAPI's response_model validation + jsonable_encoder pass
+BookmarkListAdapter = TypeAdapter(list[BookmarkResponse])
+FeedListAdapter = TypeAdapter(list[FeedWithItemsResponse])
@@ -2,6 +2,7 @@ import httpx
 from typing import Optional, Dict
 import logging
 import asyncio
+import random
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,38 @@ class ArchiveService:
         self.timeout = timeout
         self.max_retries = 3
         self.base_delay = 1.0  # Base delay for exponential backoff
+        self.max_delay = 30.0
+        self.jitter = 0.5  # Up to +50% so concurrent retries spread out
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (compatible; BookmarkManager/1.0; +https://github.com/bookmark-manager)"
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def _sleep_backoff(self, attempt: int, rate_limited: bool = False) -> None:
+        """Sleep with jittered exponential backoff before the next attempt"""
+        delay = self.base_delay * (2 ** attempt)
+        if rate_limited:
+            delay *= 5  # Longer delays for rate limits
+        delay = min(self.max_delay, delay * (1 + random.uniform(0, self.jitter)))
+        logger.warning(f"Retrying archive request in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close the shared client (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _validate_url(self, url: str) -> None:
         """Validate URL input before making API calls"""
@@ -22,7 +55,7 @@ class ArchiveService:
             raise ValueError("URL must be a non-empty string")
 
         # Basic URL format validation
-        if not (url_stripped.startswith("http://") or url_stripped.startswith("https://")):
+        if not url_stripped.startswith(("http://", "https://")):
             raise ValueError("URL must start with http:// or https://")
 
     async def submit_to_archive(self, url: str) -> Optional[Dict[str, str]]:
@@ -43,48 +76,42 @@ class ArchiveService:
                 "message": str(e)
             }
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; BookmarkManager/1.0; +https://github.com/bookmark-manager)"
-        }
-
         last_exception = None
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                    response = await client.get(f"{self.save_url}/{url}", headers=headers)
-
-                    if response.status_code == 200:
-                        # Archive.org redirects to the snapshot URL
-                        snapshot_url = str(response.url)
-                        logger.info(f"Successfully archived {url}: {snapshot_url}")
-                        return {"snapshot_url": snapshot_url}
-                    elif response.status_code == 429:
-                        # Rate limited - exponential backoff
-                        if attempt < self.max_retries - 1:
-                            delay = self.base_delay * (2 ** attempt) * 5  # Longer delays for rate limits
-                            logger.warning(f"Archive rate limited (attempt {attempt + 1}/{self.max_retries}), waiting {delay}s before retry")
-                            await asyncio.sleep(delay)
-                        else:
-                            logger.error(f"Archive rate limited after {self.max_retries} attempts")
-                            return {
-                                "error_type": "rate_limit_error",
-                                "message": "Archive service rate limit exceeded"
-                            }
+                client = self._get_client()
+                response = await client.get(f"{self.save_url}/{url}")
+
+                if response.status_code == 200:
+                    # Archive.org redirects to the snapshot URL
+                    snapshot_url = str(response.url)
+                    logger.info(f"Successfully archived {url}: {snapshot_url}")
+                    return {"snapshot_url": snapshot_url}
+                elif response.status_code == 429:
+                    # Rate limited - exponential backoff
+                    if attempt < self.max_retries - 1:
+                        logger.warning(f"Archive rate limited (attempt {attempt + 1}/{self.max_retries})")
+                        await self._sleep_backoff(attempt, rate_limited=True)
                     else:
-                        logger.warning(f"Archive attempt {attempt + 1} failed with status {response.status_code}")
-                        if attempt >= self.max_retries - 1:
-                            return {
-                                "error_type": "http_error",
-                                "message": f"HTTP {response.status_code}"
-                            }
+                        logger.error(f"Archive rate limited after {self.max_retries} attempts")
+                        return {
+                            "error_type": "rate_limit_error",
+                            "message": "Archive service rate limit exceeded"
+                        }
+                else:
+                    logger.warning(f"Archive attempt {attempt + 1} failed with status {response.status_code}")
+                    if attempt >= self.max_retries - 1:
+                        return {
+                            "error_type": "http_error",
+                            "message": f"HTTP {response.status_code}"
+                        }
 
             except httpx.TimeoutException as e:
                 # Timeout - retry with exponential backoff
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    delay = self.base_delay * (2 ** attempt)
-                    logger.warning(f"Archive timeout for {url} (attempt {attempt + 1}/{self.max_retries}). Retrying in {delay}s...")
-                    await asyncio.sleep(delay)
+                    logger.warning(f"Archive timeout for {url} (attempt {attempt + 1}/{self.max_retries})")
+                    await self._sleep_backoff(attempt)
                 else:
                     logger.error(f"Archive timeout after {self.max_retries} attempts")
                     return {
@@ -96,9 +123,8 @@ class ArchiveService:
                 # Network error - retry with exponential backoff
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    delay = self.base_delay * (2 ** attempt)
-                    logger.warning(f"Archive network error for {url} (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay}s...")
-                    await asyncio.sleep(delay)
+                    logger.warning(f"Archive network error for {url} (attempt {attempt + 1}/{self.max_retries}): {e}")
+                    await self._sleep_backoff(attempt)
                 else:
                     logger.error(f"Archive network error after {self.max_retries} attempts: {e}")
                     return {
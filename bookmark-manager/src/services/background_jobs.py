@@ -1,42 +1,69 @@
 from src.services.jina_client import JinaClient
 from src.services.archive_service import ArchiveService
+from src import database
 from src.models import Bookmark
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import logging
-import subprocess
 import tempfile
-import glob
 import os
 from typing import Optional, AsyncGenerator
 
 logger = logging.getLogger(__name__)
 
+# Header and cue-metadata lines carrying no caption text
+_VTT_SKIP_PREFIXES = ("WEBVTT", "Kind:", "Language:", "NOTE ", "STYLE")
+
 
 def parse_vtt_to_text(vtt_path: str) -> str:
     """Extract plain text from VTT subtitle file."""
     import html
-    lines = []
+    out = []
+    prev = None
     with open(vtt_path) as f:
         for line in f:
             line = line.strip()
-            # Skip timestamps, WEBVTT header, empty lines
-            if not line or line.startswith("WEBVTT") or "-->" in line:
-                continue
-            # Skip style blocks and cue identifiers
-            if line.startswith("Kind:") or line.startswith("Language:"):
+            # Skip empty lines, timestamps, WEBVTT header and cue metadata
+            if not line or "-->" in line or line.startswith(_VTT_SKIP_PREFIXES):
                 continue
             # Decode HTML entities
-            line = html.unescape(line)
-            lines.append(line)
-    # Deduplicate consecutive identical lines (VTT often has overlapping captions)
-    deduped = []
-    for line in lines:
-        if not deduped or line != deduped[-1]:
-            deduped.append(line)
-    return " ".join(deduped)
-
-
-def fetch_youtube_data(video_id: str) -> dict:
+            if "&" in line:
+                line = html.unescape(line)
+            # Drop consecutive duplicates (VTT often has overlapping captions)
+            if line != prev:
+                out.append(line)
+                prev = line
+    return " ".join(out)
+
+
+def _read_youtube_output(tmpdir: str, video_id: str, result_data: dict) -> None:
+    """Fill title/transcript from yt-dlp's output files (blocking file I/O)."""
+    import json
+    # One directory pass for both output files
+    info_path = vtt_path = None
+    with os.scandir(tmpdir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".info.json"):
+                info_path = info_path or entry.path
+            elif entry.name.endswith(".vtt"):
+                vtt_path = vtt_path or entry.path
+
+    if info_path:
+        with open(info_path) as f:
+            info = json.load(f)
+            result_data["title"] = info.get("title")
+            logger.info(f"Got title for {video_id}: {result_data['title'][:50] if result_data['title'] else 'None'}")
+
+    # Use the .vtt file for the transcript
+    if vtt_path:
+        text = parse_vtt_to_text(vtt_path)
+        if text:
+            result_data["transcript"] = text
+            logger.info(f"Got transcript for {video_id} ({len(text)} chars)")
+
+
+async def fetch_youtube_data(video_id: str) -> dict:
     """Fetch YouTube video data using yt-dlp.
 
     Returns dict with 'title' and 'transcript' keys.
@@ -69,30 +96,26 @@ def fetch_youtube_data(video_id: str) -> dict:
                 cmd.insert(1, "--cookies")
                 cmd.insert(2, cookies_path)
 
-            subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-            # Get title from info JSON
-            import json
-            info_files = glob.glob(os.path.join(tmpdir, "*.info.json"))
-            if info_files:
-                with open(info_files[0]) as f:
-                    info = json.load(f)
-                    result_data["title"] = info.get("title")
-                    logger.info(f"Got title for {video_id}: {result_data['title'][:50] if result_data['title'] else 'None'}")
-
-            # Find .vtt file for transcript
-            vtt_files = glob.glob(os.path.join(tmpdir, "*.vtt"))
-            if vtt_files:
-                text = parse_vtt_to_text(vtt_files[0])
-                if text:
-                    result_data["transcript"] = text
-                    logger.info(f"Got transcript for {video_id} ({len(text)} chars)")
+            # Run yt-dlp without blocking the event loop
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                logger.warning(f"yt-dlp timeout for {video_id}")
+                return result_data
+
+            await asyncio.to_thread(_read_youtube_output, tmpdir, video_id, result_data)
 
             if not result_data["transcript"]:
-                logger.warning(f"No subtitles found for {video_id}: {result.stderr[:200] if result.stderr else 'no output'}")
+                stderr_text = stderr.decode(errors="replace")[:200] if stderr else "no output"
+                logger.warning(f"No subtitles found for {video_id}: {stderr_text}")
 
-    except subprocess.TimeoutExpired:
-        logger.warning(f"yt-dlp timeout for {video_id}")
     except Exception as e:
         logger.warning(f"Could not fetch YouTube data for {video_id}: {e}")
 
@@ -104,6 +127,11 @@ class BackgroundJobService:
         self.archive_service = ArchiveService()
         self.llm_service = None  # Lazy load
         self.oauth_token = oauth_token
+        # Per instance (the app has one) so bursts of new bookmarks can't
+        # flood the upstream services and trip their rate limits
+        self._jina_sem = asyncio.Semaphore(4)
+        self._llm_sem = asyncio.Semaphore(2)
+        self._archive_sem = asyncio.Semaphore(2)
 
     def _get_llm_service(self):
         """Lazy load LLM service"""
@@ -116,6 +144,23 @@ class BackgroundJobService:
                 self.llm_service = False  # Mark as unavailable
         return self.llm_service if self.llm_service is not False else None
 
+    async def aclose(self) -> None:
+        """Close the Jina and archive clients (called on app shutdown)"""
+        await self.jina_client.aclose()
+        await self.archive_service.aclose()
+
+    async def _extract_metadata(self, url: str, refresh: bool = False) -> dict:
+        async with self._jina_sem:
+            return await self.jina_client.extract_metadata(url, refresh=refresh)
+
+    async def _summarize(self, llm_service, content: str, url: str) -> Optional[str]:
+        async with self._llm_sem:
+            return await llm_service.summarize_content(content, url)
+
+    async def _submit_to_archive(self, url: str) -> Optional[dict]:
+        async with self._archive_sem:
+            return await self.archive_service.submit_to_archive(url)
+
     async def process_new_bookmark(self, bookmark_id: int, session: AsyncSession):
         """Process a new bookmark: fetch metadata, generate embedding, archive"""
         logger.info(f"Processing bookmark {bookmark_id}")
@@ -129,19 +174,19 @@ class BackgroundJobService:
         # 1. For YouTube videos, get data from yt-dlp; otherwise use Jina
         if bookmark.video_id:
             logger.info(f"Fetching YouTube data for {bookmark.video_id}")
-            yt_data = fetch_youtube_data(bookmark.video_id)
+            yt_data = await fetch_youtube_data(bookmark.video_id)
             bookmark.title = yt_data["title"] or "Untitled"
             full_content = yt_data["transcript"] or ""
             jina_description = ""
             if not full_content:
                 # Fallback to Jina if no transcript
                 logger.info("No transcript, falling back to Jina")
-                metadata = await self.jina_client.extract_metadata(bookmark.url)
+                metadata = await self._extract_metadata(bookmark.url)
                 full_content = metadata.get("content", "")
                 jina_description = metadata.get("description", "")
         else:
             logger.info(f"Extracting metadata for {bookmark.url}")
-            metadata = await self.jina_client.extract_metadata(bookmark.url)
+            metadata = await self._extract_metadata(bookmark.url)
             bookmark.title = metadata.get("title", "Untitled")
             jina_description = metadata.get("description", "")
             full_content = metadata.get("content", "")
@@ -153,7 +198,7 @@ class BackgroundJobService:
         llm_service = self._get_llm_service()
         if llm_service and full_content and not bookmark.video_id:
             logger.info(f"Generating LLM summary for bookmark {bookmark_id}")
-            llm_summary = await llm_service.summarize_content(full_content, bookmark.url)
+            llm_summary = await self._summarize(llm_service, full_content, bookmark.url)
             if llm_summary:
                 bookmark.description = llm_summary
                 logger.info(f"Using LLM summary ({len(llm_summary)} chars)")
@@ -167,7 +212,7 @@ class BackgroundJobService:
         # 2. Submit to Web Archive (skip videos, thesis, pinned)
         if not bookmark.is_thesis and not bookmark.pinned and not bookmark.video_id:
             logger.info(f"Submitting to Web Archive: {bookmark.url}")
-            archive_result = await self.archive_service.submit_to_archive(bookmark.url)
+            archive_result = await self._submit_to_archive(bookmark.url)
             if archive_result and "snapshot_url" in archive_result:
                 bookmark.archive_url = archive_result["snapshot_url"]
             elif archive_result and "error_type" in archive_result:
@@ -178,11 +223,16 @@ class BackgroundJobService:
         await session.commit()
         logger.info(f"Completed processing bookmark {bookmark_id}")
 
-    async def process_bookmark_with_progress(self, bookmark_id: int, session: AsyncSession) -> AsyncGenerator[str, None]:
-        """Process bookmark with progress updates for SSE streaming"""
+    async def process_bookmark_with_progress(self, bookmark_id: int) -> AsyncGenerator[str, None]:
+        """Process bookmark with progress updates for SSE streaming
+
+        Uses short-lived sessions so no connection is held while Jina,
+        the LLM or the archive are being called.
+        """
         logger.info(f"Processing bookmark {bookmark_id} with progress")
 
-        bookmark = await session.get(Bookmark, bookmark_id)
+        async with database.async_session_maker() as session:
+            bookmark = await session.get(Bookmark, bookmark_id)
         if not bookmark:
             yield "error:Bookmark not found"
             return
@@ -190,42 +240,49 @@ class BackgroundJobService:
         # Step 1: Get content (yt-dlp for videos, Jina for others)
         if bookmark.video_id:
             yield "Fetching YouTube data..."
-            yt_data = fetch_youtube_data(bookmark.video_id)
-            bookmark.title = yt_data["title"] or "Untitled"
+            yt_data = await fetch_youtube_data(bookmark.video_id)
+            title = yt_data["title"] or "Untitled"
             full_content = yt_data["transcript"] or ""
             jina_description = ""
             if not full_content:
                 yield "No transcript, trying Jina..."
-                metadata = await self.jina_client.extract_metadata(bookmark.url)
+                metadata = await self._extract_metadata(bookmark.url, refresh=True)
                 full_content = metadata.get("content", "")
                 jina_description = metadata.get("description", "")
         else:
             yield "Extracting content..."
-            metadata = await self.jina_client.extract_metadata(bookmark.url)
-            bookmark.title = metadata.get("title", "Untitled")
+            metadata = await self._extract_metadata(bookmark.url, refresh=True)
+            title = metadata.get("title", "Untitled")
             jina_description = metadata.get("description", "")
             full_content = metadata.get("content", "")
 
-        bookmark.content = full_content
-
         # Step 2: Generate summary (skip videos - transcript is the content)
         if not bookmark.video_id:
             yield "Generating summary..."
             llm_service = self._get_llm_service()
             if llm_service and full_content:
-                llm_summary = await llm_service.summarize_content(full_content, bookmark.url)
-                bookmark.description = llm_summary if llm_summary else jina_description
+                llm_summary = await self._summarize(llm_service, full_content, bookmark.url)
+                description = llm_summary if llm_summary else jina_description
             else:
-                bookmark.description = jina_description
+                description = jina_description
         else:
-            bookmark.description = f"YouTube video: {bookmark.title}"
+            description = f"YouTube video: {title}"
 
-        await session.commit()
+        await self._update_bookmark(
+            bookmark_id, title=title, content=full_content, description=description
+        )
         yield "done"
 
         # Archive in background after responding (skip videos, thesis, pinned)
         if not bookmark.is_thesis and not bookmark.pinned and not bookmark.video_id:
-            archive_result = await self.archive_service.submit_to_archive(bookmark.url)
+            archive_result = await self._submit_to_archive(bookmark.url)
             if archive_result and "snapshot_url" in archive_result:
-                bookmark.archive_url = archive_result["snapshot_url"]
-                await session.commit()
+                await self._update_bookmark(bookmark_id, archive_url=archive_result["snapshot_url"])
+
+    async def _update_bookmark(self, bookmark_id: int, **values):
+        """Write processing results in a short-lived session"""
+        async with database.async_session_maker() as session:
+            await session.execute(
+                update(Bookmark).where(Bookmark.id == bookmark_id).values(**values)
+            )
+            await session.commit()
@@ -1,7 +1,10 @@
 import os
 import gzip
+import asyncio
 import shutil
 import sqlite3
+import tempfile
+from contextlib import closing
 from datetime import datetime
 from typing import List, Dict
 from pathlib import Path
@@ -9,39 +12,41 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB
+
 
 class BackupService:
-    def __init__(self, db_path: str = "data/bookmarks.db", backup_dir: str = "data/backups"):
+    def __init__(self, db_path: str = "data/bookmarks.db", backup_dir: str = "data/backups", compresslevel: int = 3):
         self.db_path = db_path
         self.backup_dir = backup_dir
+        self.compresslevel = compresslevel
 
         # Ensure backup directory exists
         Path(self.backup_dir).mkdir(parents=True, exist_ok=True)
 
     async def create_backup(self) -> str:
         """Create a compressed backup of the database"""
+        return await asyncio.to_thread(self._create_backup_sync)
+
+    def _create_backup_sync(self) -> str:
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"backup_{timestamp}.db"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-        compressed_path = f"{backup_path}.gz"
+        compressed_path = os.path.join(self.backup_dir, f"backup_{timestamp}.db.gz")
 
         try:
-            # Use SQLite backup API for consistency
-            source_conn = sqlite3.connect(self.db_path)
-            backup_conn = sqlite3.connect(backup_path)
+            # Use SQLite backup API for consistency; the snapshot lives in a
+            # temp file that is removed as soon as it has been compressed
+            with tempfile.NamedTemporaryFile(dir=self.backup_dir, suffix=".db") as snapshot:
+                source_conn = sqlite3.connect(self.db_path)
+                backup_conn = sqlite3.connect(snapshot.name)
 
-            source_conn.backup(backup_conn)
+                source_conn.backup(backup_conn)
 
-            source_conn.close()
-            backup_conn.close()
+                source_conn.close()
+                backup_conn.close()
 
-            # Compress the backup
-            with open(backup_path, 'rb') as f_in:
-                with gzip.open(compressed_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-            # Remove uncompressed backup
-            os.remove(backup_path)
+                # Stream into the archive; level 3 is much faster than the default 9
+                with gzip.open(compressed_path, 'wb', compresslevel=self.compresslevel) as f_out:
+                    shutil.copyfileobj(snapshot, f_out, COPY_BUFFER_SIZE)
 
             # Get file size
             size = os.path.getsize(compressed_path)
@@ -55,43 +60,50 @@ class BackupService:
 
     async def list_backups(self) -> List[Dict]:
         """List all available backups"""
+        return await asyncio.to_thread(self._list_backups_sync)
+
+    def _list_backups_sync(self) -> List[Dict]:
         backups = []
 
         if not os.path.exists(self.backup_dir):
             return backups
 
-        for filename in os.listdir(self.backup_dir):
-            if filename.endswith(".db.gz"):
-                filepath = os.path.join(self.backup_dir, filename)
-                stat = os.stat(filepath)
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".db.gz"):
+                    stat = entry.stat()
 
-                backups.append({
-                    "filename": filename,
-                    "path": filepath,
-                    "size": stat.st_size,
-                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat()
-                })
+                    backups.append({
+                        "filename": entry.name,
+                        "path": entry.path,
+                        "size": stat.st_size,
+                        "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat()
+                    })
 
         backups.sort(key=lambda x: x["created_at"], reverse=True)
         return backups
 
     async def restore_backup(self, backup_filename: str) -> bool:
         """Restore database from a backup"""
+        return await asyncio.to_thread(self._restore_backup_sync, backup_filename)
+
+    def _restore_backup_sync(self, backup_filename: str) -> bool:
         backup_path = os.path.join(self.backup_dir, backup_filename)
 
         if not os.path.exists(backup_path):
             raise FileNotFoundError(f"Backup not found: {backup_filename}")
 
         try:
-            # Decompress
-            temp_path = backup_path.replace(".gz", "")
-            with gzip.open(backup_path, 'rb') as f_in:
-                with open(temp_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-            # Replace current database
-            shutil.copy2(temp_path, self.db_path)
-            os.remove(temp_path)
+            # Decompress to a temp file, then copy it into the live database
+            # through the backup API so open connections see the restore
+            with tempfile.NamedTemporaryFile(dir=self.backup_dir, suffix=".db") as snapshot:
+                with gzip.open(backup_path, 'rb') as f_in:
+                    shutil.copyfileobj(f_in, snapshot, COPY_BUFFER_SIZE)
+                snapshot.flush()
+
+                with closing(sqlite3.connect(snapshot.name)) as source_conn, \
+                        closing(sqlite3.connect(self.db_path)) as target_conn:
+                    source_conn.backup(target_conn)
 
             logger.info(f"Restored backup: {backup_filename}")
             return True
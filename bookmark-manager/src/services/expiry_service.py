@@ -1,54 +1,60 @@
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import delete
 import logging
 
+from src.models import Bookmark, FeedItem
+
 logger = logging.getLogger(__name__)
 
 
-async def expire_old_bookmarks(session: AsyncSession) -> int:
-    """Delete bookmarks past their expiry date. Returns count deleted."""
-    # Use ISO format string for SQLite text comparison compatibility
-    # SQLite stores dates as TEXT, so we need consistent format
-    now_iso = datetime.utcnow().isoformat()
+async def expire_old_bookmarks(session: AsyncSession, commit: bool = True) -> int:
+    """Delete bookmarks past their expiry date. Returns count deleted.
 
-    # Count before delete using raw SQL for reliable text comparison
-    count_result = await session.execute(
-        text("SELECT COUNT(*) FROM bookmarks WHERE expires_at IS NOT NULL AND expires_at < :now"),
-        {"now": now_iso}
+    Pass commit=False to leave the transaction to the caller.
+    """
+    # Pinned/thesis bookmarks always have expires_at NULL; filtering on those
+    # flags here would steer SQLite off the partial expires_at index
+    result = await session.execute(
+        delete(Bookmark)
+        .where(
+            Bookmark.expires_at.isnot(None),
+            Bookmark.expires_at < datetime.utcnow()
+        )
+        .execution_options(synchronize_session=False)
     )
-    count = count_result.scalar()
+    count = result.rowcount
 
     if count > 0:
-        await session.execute(
-            text("DELETE FROM bookmarks WHERE expires_at IS NOT NULL AND expires_at < :now"),
-            {"now": now_iso}
-        )
-        await session.commit()
-        # Expire session cache since raw SQL bypasses ORM identity map
+        if commit:
+            await session.commit()
+        # Expire session cache since the bulk delete bypasses the identity map
         session.expire_all()
         logger.info(f"Expired {count} bookmarks")
 
     return count
 
 
-async def expire_old_feed_items(session: AsyncSession) -> int:
-    """Delete feed items older than 7 days. Returns count deleted."""
-    # Use ISO format string for SQLite text comparison compatibility
-    cutoff_iso = (datetime.utcnow() - timedelta(days=7)).isoformat()
+async def expire_old_feed_items(session: AsyncSession, commit: bool = True) -> int:
+    """Delete feed items older than 7 days. Returns count deleted.
 
-    count_result = await session.execute(
-        text("SELECT COUNT(*) FROM feed_items WHERE published_at IS NOT NULL AND published_at < :cutoff"),
-        {"cutoff": cutoff_iso}
+    Pass commit=False to leave the transaction to the caller.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=7)
+
+    result = await session.execute(
+        delete(FeedItem)
+        .where(
+            FeedItem.published_at.isnot(None),
+            FeedItem.published_at < cutoff
+        )
+        .execution_options(synchronize_session=False)
     )
-    count = count_result.scalar()
+    count = result.rowcount
 
     if count > 0:
-        await session.execute(
-            text("DELETE FROM feed_items WHERE published_at IS NOT NULL AND published_at < :cutoff"),
-            {"cutoff": cutoff_iso}
-        )
-        await session.commit()
+        if commit:
+            await session.commit()
         session.expire_all()
         logger.info(f"Expired {count} feed items")
 
@@ -1,42 +1,159 @@
 # src/services/feed_service.py
+import asyncio
 import feedparser
+import hashlib
 import httpx
 import logging
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from src.models import Feed, FeedItem
 
 logger = logging.getLogger(__name__)
 
 
+def entry_published_at(entry) -> Optional[datetime]:
+    """Naive-UTC publish date of a feed entry.
+
+    feedparser has already parsed the date while parsing the feed, so its
+    struct_time is used first; the raw string is only parsed again (RFC 822,
+    then ISO 8601) when feedparser could not make sense of it.
+    """
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if parsed:
+        try:
+            return datetime(*parsed[:6])
+        except Exception:
+            pass
+
+    raw = entry.get('published') or entry.get('updated')
+    if not raw:
+        return None
+    try:
+        value = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        try:
+            value = datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def extract_items(entries) -> list[tuple]:
+    """(guid, url, title, description, published_at) per usable entry.
+
+    Plain tuples in one pass, so the rest of the refresh never goes back
+    through FeedParserDict's key-mapping lookups.
+    """
+    items = []
+    append = items.append
+    for entry in entries:
+        get = entry.get
+        url = get('link')
+        title = get('title')
+        guid = get('id') or url or title
+        if not guid:
+            continue
+        append((
+            guid,
+            url or '',
+            title,
+            get('summary') or get('description'),
+            entry_published_at(entry),
+        ))
+    return items
+
+
 class FeedService:
     def __init__(self):
         self.timeout = 30.0
+        self.max_concurrent_fetches = 10
+        self._client: Optional[httpx.AsyncClient] = None
+        # LRU of feed url -> (created, content digest, parsed feed); only
+        # the latest parse per feed is kept
+        self._parsed_cache: OrderedDict[str, tuple[float, bytes, dict]] = OrderedDict()
+        self._parsed_cache_ttl = 6 * 3600
+        self._parsed_cache_size = 128
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20)
+            )
+        return self._client
+
+    def _parsed_cache_get(self, url: str, digest: bytes) -> Optional[dict]:
+        entry = self._parsed_cache.get(url)
+        if entry is None:
+            return None
+        created, cached_digest, parsed = entry
+        if cached_digest != digest or time.monotonic() - created > self._parsed_cache_ttl:
+            del self._parsed_cache[url]
+            return None
+        self._parsed_cache.move_to_end(url)
+        return parsed
+
+    def _parsed_cache_put(self, url: str, digest: bytes, parsed: dict) -> None:
+        self._parsed_cache[url] = (time.monotonic(), digest, parsed)
+        self._parsed_cache.move_to_end(url)
+        if len(self._parsed_cache) > self._parsed_cache_size:
+            self._parsed_cache.popitem(last=False)
+
+    async def aclose(self) -> None:
+        """Close the shared client (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def fetch_and_parse(self, url: str) -> Optional[dict]:
         """Fetch RSS feed and parse it"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=self.timeout, follow_redirects=True)
-                response.raise_for_status()
-                content = response.text
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            content = response.content
         except Exception as e:
             logger.error(f"Failed to fetch feed {url}: {e}")
             return None
 
-        parsed = feedparser.parse(content)
+        # Unchanged feed body: reuse the last parse instead of running feedparser again
+        digest = hashlib.sha256(content).digest()
+        cached = self._parsed_cache_get(url, digest)
+        if cached is not None:
+            return cached
+
+        # Raw bytes + headers let feedparser pick the declared encoding itself;
+        # relative-URI resolution is an extra pass over every HTML field
+        # feedparser is CPU-bound pure Python; parse in a worker thread
+        parsed = await asyncio.to_thread(
+            feedparser.parse,
+            content,
+            response_headers={"content-type": response.headers.get("content-type", "")},
+            resolve_relative_uris=False
+        )
         if parsed.bozo and not parsed.entries:
             logger.error(f"Failed to parse feed {url}: {parsed.bozo_exception}")
             return None
 
+        self._parsed_cache_put(url, digest, parsed)
         return parsed
 
     async def refresh_feed(self, feed: Feed, session: AsyncSession) -> int:
         """Refresh a single feed, returns count of new items"""
         parsed = await self.fetch_and_parse(feed.url)
+        return await self.store_parsed(feed, parsed, session)
 
+    async def store_parsed(self, feed: Feed, parsed: Optional[dict], session: AsyncSession) -> int:
+        """Store a fetched feed's new entries, returns count of new items"""
         if parsed is None:
             feed.error_count += 1
             await session.commit()
@@ -50,43 +167,41 @@ class FeedService:
         if not feed.title and parsed.feed.get('title'):
             feed.title = parsed.feed.get('title')
 
-        new_count = 0
-        for entry in parsed.entries:
-            guid = entry.get('id') or entry.get('link') or entry.get('title')
-            if not guid:
-                continue
+        items = extract_items(parsed.entries)
 
-            # Check if item already exists
-            existing = await session.execute(
-                select(FeedItem).where(
-                    FeedItem.feed_id == feed.id,
-                    FeedItem.guid == guid
-                )
+        # One lookup for all guids instead of one per entry
+        existing = await session.execute(
+            select(FeedItem.guid).where(
+                FeedItem.feed_id == feed.id,
+                FeedItem.guid.in_([item[0] for item in items])
             )
-            if existing.scalar_one_or_none():
-                continue
+        )
+        seen_guids = set(existing.scalars().all())
 
-            # Parse published date
-            published_at = None
-            if entry.get('published_parsed'):
-                try:
-                    published_at = datetime(*entry.published_parsed[:6])
-                except Exception:
-                    pass
-
-            item = FeedItem(
-                feed_id=feed.id,
-                guid=guid,
-                url=entry.get('link', ''),
-                title=entry.get('title'),
-                description=entry.get('summary') or entry.get('description'),
-                published_at=published_at
+        rows = []
+        for guid, url, title, description, published_at in items:
+            if guid in seen_guids:
+                continue
+            seen_guids.add(guid)
+
+            rows.append({
+                "feed_id": feed.id,
+                "guid": guid,
+                "url": url,
+                "title": title,
+                "description": description,
+                "published_at": published_at,
+            })
+
+        if rows:
+            # Core executemany; ON CONFLICT guards against a concurrent refresh
+            await session.execute(
+                insert(FeedItem).on_conflict_do_nothing(index_elements=["feed_id", "guid"]),
+                rows
             )
-            session.add(item)
-            new_count += 1
 
         await session.commit()
-        return new_count
+        return len(rows)
 
     async def refresh_all_feeds(self, session: AsyncSession) -> dict:
         """Refresh all feeds that haven't errored out"""
@@ -95,10 +210,22 @@ class FeedService:
         )
         feeds = result.scalars().all()
 
+        # Fetch concurrently; the session is not safe for concurrent use, so
+        # results are stored one feed at a time
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+
+        async def fetch(feed: Feed):
+            async with semaphore:
+                return await self.fetch_and_parse(feed.url)
+
+        fetched = await asyncio.gather(*(fetch(feed) for feed in feeds), return_exceptions=True)
+
         stats = {"refreshed": 0, "new_items": 0, "errors": 0}
-        for feed in feeds:
+        for feed, parsed in zip(feeds, fetched):
             try:
-                new_count = await self.refresh_feed(feed, session)
+                if isinstance(parsed, Exception):
+                    raise parsed
+                new_count = await self.store_parsed(feed, parsed, session)
                 stats["refreshed"] += 1
                 stats["new_items"] += new_count
             except Exception as e:
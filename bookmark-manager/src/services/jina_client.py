@@ -1,10 +1,34 @@
 import httpx
+import io
 from typing import Dict, Optional
 import logging
 import asyncio
+import random
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
+TRACKING_PARAMS = frozenset({"fbclid", "gclid"})
+
+
+def canonicalize_url(url: str) -> str:
+    """Drop tracking params, fragment and trailing slash; lowercase the host"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        urlencode(query),
+        "",
+    ))
+
+
 class JinaClient:
     def __init__(self, api_key: Optional[str] = None, timeout: float = 30.0):
         self.base_url = "https://r.jina.ai"
@@ -12,6 +36,52 @@ class JinaClient:
         self.timeout = timeout
         self.max_retries = 3
         self.base_delay = 1.0  # Base delay for exponential backoff
+        self.max_delay = 30.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: OrderedDict[str, tuple[float, Dict[str, str]]] = OrderedDict()
+        self._cache_ttl = 3600
+        self._cache_size = 256
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            headers = {}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers=headers,
+                limits=httpx.Limits(max_keepalive_connections=20)
+            )
+        return self._client
+
+    def _compute_backoff(self, attempt: int) -> float:
+        """Full-jitter delay so concurrent imports don't retry in lockstep"""
+        return random.uniform(0, min(self.base_delay * (2 ** attempt), self.max_delay))
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, str]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created, result = entry
+        if time.monotonic() - created > self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return dict(result)
+
+    def _cache_put(self, key: str, result: Dict[str, str]) -> None:
+        self._cache[key] = (time.monotonic(), dict(result))
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def aclose(self) -> None:
+        """Close the shared client (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _validate_url(self, url: str) -> None:
         """Validate URL input before making API calls"""
@@ -23,12 +93,40 @@ class JinaClient:
             raise ValueError("URL must be a non-empty string")
 
         # Basic URL format validation
-        if not (url_stripped.startswith("http://") or url_stripped.startswith("https://")):
+        if not url_stripped.startswith(("http://", "https://")):
             raise ValueError("URL must start with http:// or https://")
 
-    async def extract_metadata(self, url: str) -> Dict[str, str]:
+    @staticmethod
+    def _parse_title_description(content: str) -> tuple[str, str]:
+        """Find title and description in one pass over Jina's markdown,
+        stopping as soon as both are known"""
+        title = ""
+        description = ""
+        in_markdown_section = False
+        for line in io.StringIO(content):
+            line = line.rstrip("\n")
+            if line.startswith("Title: "):
+                title = line[7:].strip()
+            elif line.startswith("# ") and not title:
+                title = line[2:].strip()
+
+            if description:
+                if title:
+                    break
+            elif line.startswith("Markdown Content:"):
+                in_markdown_section = True
+            elif in_markdown_section and line.strip() and not line.startswith("["):
+                description = line.strip()
+                if title:
+                    break
+        return title, description
+
+    async def extract_metadata(self, url: str, refresh: bool = False) -> Dict[str, str]:
         """Extract title, description, and content from URL using Jina AI
 
+        Results with content are cached by canonical URL, so tracking-param
+        variants share one fetch; refresh skips the cache lookup. The
+        original URL is what gets fetched.
         Implements retry logic with exponential backoff for transient failures.
         """
         # Validate input
@@ -43,59 +141,40 @@ class JinaClient:
                 "error_type": "validation_error"
             }
 
+        cache_key = canonicalize_url(url)
+        cached = None if refresh else self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # Retry loop with exponential backoff
         last_exception = None
         for attempt in range(self.max_retries):
             try:
-                headers = {}
-                if self.api_key:
-                    headers["Authorization"] = f"Bearer {self.api_key}"
-
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(
-                        f"{self.base_url}/{url}",
-                        headers=headers,
-                        follow_redirects=True
-                    )
-                    response.raise_for_status()
-
-                    # Jina returns markdown content
-                    content = response.text
-
-                    # Extract title and description from Jina response
-                    title = ""
-                    description = ""
-                    lines = content.split("\n")
-
-                    # Look for "Title:" prefix in the response
-                    for i, line in enumerate(lines):
-                        if line.startswith("Title: "):
-                            title = line[7:].strip()
-                        elif line.startswith("# ") and not title:
-                            title = line[2:].strip()
-
-                    # Extract description from the markdown content section
-                    in_markdown_section = False
-                    for line in lines:
-                        if "Markdown Content:" in line:
-                            in_markdown_section = True
-                            continue
-                        if in_markdown_section and line.strip() and not line.startswith("["):
-                            description = line.strip()
-                            break
-
-                    return {
-                        "title": title or "Untitled",
-                        "description": description or "",
-                        "content": content
-                    }
+                client = self._get_client()
+                response = await client.get(f"{self.base_url}/{url}")
+                response.raise_for_status()
+
+                # Jina returns markdown content
+                content = response.text
+
+                title, description = self._parse_title_description(content)
+
+                result = {
+                    "title": title or "Untitled",
+                    "description": description or "",
+                    "content": content
+                }
+                # Empty scrapes stay uncached so a retry goes upstream
+                if content:
+                    self._cache_put(cache_key, result)
+                return result
 
             except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
                 # Transient errors - retry with exponential backoff
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    delay = self.base_delay * (2 ** attempt)
-                    logger.warning(f"Transient error for {url} (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay}s...")
+                    delay = self._compute_backoff(attempt)
+                    logger.warning(f"Transient error for {url} (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay:.1f}s...")
                     await asyncio.sleep(delay)
                 else:
                     logger.error(f"Max retries reached for {url}: {e}")
@@ -1,10 +1,37 @@
 import os
+import time
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Optional
 from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage, TextBlock
 
 logger = logging.getLogger(__name__)
 
+# Input budget per summary. Tokens are estimated without a tokenizer:
+# ~4 ASCII chars per token, ~1 token per other char (CJK etc.)
+MAX_CONTENT_TOKENS = 2500
+CHARS_PER_ASCII_TOKEN = 4
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You summarize web pages. Reply with 2-3 clear, informative sentences "
+    "covering the main topic and key points. Output ONLY the summary text - "
+    "no tool use, no preamble."
+)
+
+
+def truncate_to_tokens(content: str, max_tokens: int = MAX_CONTENT_TOKENS) -> str:
+    """Cut content to roughly max_tokens tokens"""
+    if content.isascii():
+        return content[:max_tokens * CHARS_PER_ASCII_TOKEN]
+
+    budget = max_tokens * CHARS_PER_ASCII_TOKEN
+    for i, char in enumerate(content):
+        budget -= 1 if char.isascii() else CHARS_PER_ASCII_TOKEN
+        if budget < 0:
+            return content[:i]
+    return content
+
 class LLMService:
     def __init__(self, oauth_token: Optional[str] = None):
         """Initialize LLM service with Claude Code OAuth token
@@ -20,8 +47,36 @@ class LLMService:
             raise ValueError("CLAUDE_CODE_OAUTH_TOKEN is required")
 
         self.model = "haiku"  # claude-agent-sdk uses 'haiku' or 'sonnet'
+        # LRU of content hash -> (created, summary); re-scrapes, retries
+        # and duplicates of the same page skip the API call
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._cache_ttl = 3600
+        self._cache_size = 512
         logger.info(f"Initialized LLM service with model: {self.model}")
 
+    def _cache_key(self, content: str) -> str:
+        """Key on normalized content only, so mirrors, tracking-param
+        variants and re-scrapes differing in whitespace share a summary"""
+        normalized = " ".join(content.split()).casefold()
+        return hashlib.sha256(f"{self.model}|{normalized}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created, summary = entry
+        if time.monotonic() - created > self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return summary
+
+    def _cache_put(self, key: str, summary: str) -> None:
+        self._cache[key] = (time.monotonic(), summary)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     async def summarize_content(self, content: str, url: str) -> str:
         """
         Generate a 2-3 sentence summary of webpage content.
@@ -37,26 +92,25 @@ class LLMService:
             return ""
 
         # Truncate very long content to avoid token limits
-        max_chars = 10000
-        truncated_content = content[:max_chars]
-        if len(content) > max_chars:
+        truncated_content = truncate_to_tokens(content)
+        if len(truncated_content) < len(content):
             truncated_content += "\n\n[Content truncated...]"
 
-        prompt = f"""Summarize this webpage in 2-3 clear, informative sentences. Focus on the main topic and key points.
-
-URL: {url}
-
-Content:
-{truncated_content}
+        cache_key = self._cache_key(truncated_content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached summary for {url}")
+            return cached
 
-Summary (2-3 sentences):"""
+        # Instructions live in the system prompt; the user turn is just the page
+        prompt = f"URL: {url}\n\n{truncated_content}"
 
         try:
             options = ClaudeAgentOptions(
                 model=self.model,
                 max_turns=1,  # Just one response
                 allowed_tools=[],  # Disable all tools - we just want text summary
-                system_prompt="You are a helpful assistant that summarizes web content. Output ONLY the summary text - no tool use, no preamble."
+                system_prompt=SUMMARY_SYSTEM_PROMPT
             )
 
             summary_text = ""
@@ -68,6 +122,8 @@ Summary (2-3 sentences):"""
 
             summary = summary_text.strip()
             logger.info(f"Generated summary for {url}: {len(summary)} chars")
+            if summary:
+                self._cache_put(cache_key, summary)
             return summary
 
         except Exception as e:
@@ -1,6 +1,7 @@
 """Paper and academic URL detection utilities."""
 
 import re
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -65,15 +66,42 @@ ACADEMIC_DOMAINS = [
     "osti.gov",
 ]
 
+_ACADEMIC_DOMAINS = frozenset(ACADEMIC_DOMAINS)
 
+_DOI_RE = re.compile(r'(?:doi\.org|dx\.doi\.org)/(.+?)(?:\?|#|$)')
+_ARXIV_RE = re.compile(r'arxiv\.org/abs/(\d+\.\d+)')
+
+
+def _host(url: str) -> str:
+    """Host part of a URL without userinfo or port.
+
+    Plain scheme://host URLs are sliced directly; anything else goes
+    through urlparse.
+    """
+    start = url.find("://")
+    if start < 0:
+        netloc = urlparse(url).netloc
+    else:
+        rest = url[start + 3:]
+        end = len(rest)
+        for sep in "/?#":
+            i = rest.find(sep, 0, end)
+            if i >= 0:
+                end = i
+        netloc = rest[:end]
+    return netloc.rpartition("@")[2].split(":", 1)[0]
+
+
+@lru_cache(maxsize=4096)
 def is_academic_url(url: str) -> bool:
     """Check if URL is from an academic domain."""
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower().replace("www.", "")
+        domain = _host(url).lower().removeprefix("www.")
 
-        for academic_domain in ACADEMIC_DOMAINS:
-            if domain == academic_domain or domain.endswith("." + academic_domain):
+        # Check the domain and each parent domain against the set
+        labels = domain.split(".")
+        for i in range(len(labels)):
+            if ".".join(labels[i:]) in _ACADEMIC_DOMAINS:
                 return True
         return False
     except Exception:
@@ -84,12 +112,12 @@ def extract_doi(url: str) -> Optional[str]:
     """Extract DOI from URL if possible."""
     try:
         # Direct DOI URL: doi.org/10.xxx or dx.doi.org/10.xxx
-        doi_match = re.search(r'(?:doi\.org|dx\.doi\.org)/(.+?)(?:\?|#|$)', url)
+        doi_match = _DOI_RE.search(url)
         if doi_match:
             return doi_match.group(1).rstrip('/')
 
         # ArXiv: convert to DOI format
-        arxiv_match = re.search(r'arxiv\.org/abs/(\d+\.\d+)', url)
+        arxiv_match = _ARXIV_RE.search(url)
         if arxiv_match:
             return f"10.48550/arXiv.{arxiv_match.group(1)}"
 
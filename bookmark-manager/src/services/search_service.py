@@ -1,11 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, table, column, text
 from src.models import Bookmark, BookmarkState
 from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+bookmarks_fts = table("bookmarks_fts", column("rowid"))
+
+
+def fts_query(query: str) -> str:
+    """Turn user input into an FTS5 query: every term quoted (so FTS
+    syntax characters are literal) and prefix-matched, all terms required"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
 class SearchService:
     async def keyword_search(
         self,
@@ -14,20 +24,22 @@ class SearchService:
         state_filter: Optional[str] = None,
         limit: int = 20
     ) -> List[Bookmark]:
-        """Simple keyword search on title and description"""
-        stmt = select(Bookmark).where(
-            or_(
-                Bookmark.title.ilike(f"%{query}%"),
-                Bookmark.description.ilike(f"%{query}%"),
-                Bookmark.url.ilike(f"%{query}%")
-            )
+        """Full-text search on title, description and URL, best matches first"""
+        match = fts_query(query)
+        if not match:
+            return []
+
+        stmt = (
+            select(Bookmark)
+            .join(bookmarks_fts, bookmarks_fts.c.rowid == Bookmark.id)
+            .where(text("bookmarks_fts MATCH :match").bindparams(match=match))
         )
 
         if state_filter:
             state_enum = BookmarkState(state_filter)
             stmt = stmt.where(Bookmark.state == state_enum)
 
-        stmt = stmt.order_by(Bookmark.added_at.desc()).limit(limit)
+        stmt = stmt.order_by(text("bm25(bookmarks_fts)")).limit(limit)
 
         result = await session.execute(stmt)
         return result.scalars().all()
@@ -1,13 +1,120 @@
 """Zotero Web API integration for paper sync."""
 
+import asyncio
 import httpx
 import logging
-from typing import Optional, Dict, Any
+import orjson
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models import ZoteroSync
+from src.services.jina_client import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
 ZOTERO_API_BASE = "https://api.zotero.org"
 API_VERSION = "3"
+ZOTERO_BATCH_SIZE = 50  # Max items per write request
+MAX_CONCURRENT_LOOKUPS = 8
+CROSSREF_BATCH_SIZE = 50  # DOIs per /works?filter= request
+
+# Shared by every ZoteroService so CrossRef and Zotero calls reuse
+# keep-alive connections across syncs
+_zotero_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_zotero_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use"""
+    global _zotero_client
+    if _zotero_client is None or _zotero_client.is_closed:
+        _zotero_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+    return _zotero_client
+
+
+# DOI metadata never changes, so lookups are cached per process; DOIs
+# CrossRef has no work for are cached briefly so they aren't retried on
+# every sync. Failed requests are not cached at all
+CROSSREF_CACHE_SIZE = 512
+CROSSREF_TTL = 30 * 24 * 3600
+CROSSREF_MISS_TTL = 3600
+_crossref_cache: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+
+def _crossref_cache_get(doi: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Return (hit, metadata); metadata is a copy callers may modify"""
+    entry = _crossref_cache.get(doi.lower())
+    if entry is None:
+        return False, None
+    expires, metadata = entry
+    if time.monotonic() > expires:
+        del _crossref_cache[doi.lower()]
+        return False, None
+    _crossref_cache.move_to_end(doi.lower())
+    return True, dict(metadata) if metadata else None
+
+
+def _crossref_cache_put(doi: str, metadata: Optional[Dict[str, Any]]) -> None:
+    ttl = CROSSREF_TTL if metadata else CROSSREF_MISS_TTL
+    _crossref_cache[doi.lower()] = (time.monotonic() + ttl, dict(metadata) if metadata else None)
+    _crossref_cache.move_to_end(doi.lower())
+    if len(_crossref_cache) > CROSSREF_CACHE_SIZE:
+        _crossref_cache.popitem(last=False)
+
+
+def _dedup_key(url: str, doi: Optional[str]) -> str:
+    """zotero_sync key: the DOI, or the canonical URL when there is none"""
+    return f"doi:{doi.lower()}" if doi else f"url:{canonicalize_url(url)}"
+
+
+async def _record_synced(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Remember created items; a concurrent sync of the same paper may
+    already have recorded its own, which is kept"""
+    if not rows:
+        return
+    await session.execute(
+        insert(ZoteroSync).on_conflict_do_nothing(index_elements=["dedup_key"]),
+        rows
+    )
+    await session.commit()
+
+
+async def close_zotero_client() -> None:
+    """Close the shared client (called on app shutdown)"""
+    global _zotero_client
+    if _zotero_client is not None:
+        await _zotero_client.aclose()
+        _zotero_client = None
+
+
+def _work_to_item(work: Dict[str, Any], doi: str) -> Dict[str, Any]:
+    """Zotero journalArticle item from a CrossRef work record"""
+    creators = []
+    for author in work.get("author", []):
+        creators.append({
+            "creatorType": "author",
+            "firstName": author.get("given", ""),
+            "lastName": author.get("family", ""),
+        })
+
+    date_parts = work.get("published", {}).get("date-parts", [[]])
+    date = "-".join(str(p) for p in date_parts[0]) if date_parts[0] else None
+
+    return {
+        "itemType": "journalArticle",
+        "title": work.get("title", ["Untitled"])[0],
+        "creators": creators,
+        "date": date,
+        "DOI": doi,
+        "url": work.get("URL"),
+        "abstractNote": work.get("abstract", "").replace("<jats:p>", "").replace("</jats:p>", ""),
+        "publicationTitle": work.get("container-title", [""])[0],
+    }
 
 
 class ZoteroService:
@@ -28,96 +135,132 @@ class ZoteroService:
 
     async def _fetch_metadata_by_doi(self, doi: str) -> Optional[Dict[str, Any]]:
         """Fetch metadata from CrossRef by DOI."""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.crossref.org/works/{doi}",
-                    timeout=30.0
-                )
-                if not response.is_success:
-                    return None
-
-                data = response.json()
-                work = data.get("message", {})
-
-                creators = []
-                for author in work.get("author", []):
-                    creators.append({
-                        "creatorType": "author",
-                        "firstName": author.get("given", ""),
-                        "lastName": author.get("family", ""),
-                    })
-
-                date_parts = work.get("published", {}).get("date-parts", [[]])
-                date = "-".join(str(p) for p in date_parts[0]) if date_parts[0] else None
+        hit, metadata = _crossref_cache_get(doi)
+        if hit:
+            return metadata
 
-                return {
-                    "itemType": "journalArticle",
-                    "title": work.get("title", ["Untitled"])[0],
-                    "creators": creators,
-                    "date": date,
-                    "DOI": doi,
-                    "url": work.get("URL"),
-                    "abstractNote": work.get("abstract", "").replace("<jats:p>", "").replace("</jats:p>", ""),
-                    "publicationTitle": work.get("container-title", [""])[0],
-                }
+        try:
+            metadata = await self._query_crossref(doi)
         except Exception as e:
             logger.error(f"Failed to fetch DOI metadata: {e}")
             return None
+        _crossref_cache_put(doi, metadata)
+        return metadata
+
+    async def _query_crossref(self, doi: str) -> Optional[Dict[str, Any]]:
+        """Work for one DOI, None if CrossRef has none; raises on failure"""
+        response = await _get_zotero_client().get(
+            f"https://api.crossref.org/works/{doi}"
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        return _work_to_item(data.get("message", {}), doi)
+
+    async def _fetch_metadata_by_dois(self, dois: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch metadata for many DOIs, CROSSREF_BATCH_SIZE per request.
+
+        Returns metadata keyed by lowercased DOI, None for DOIs not found.
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing: Dict[str, str] = {}
+        for doi in dois:
+            hit, metadata = _crossref_cache_get(doi)
+            if hit:
+                results[doi.lower()] = metadata
+            else:
+                missing.setdefault(doi.lower(), doi)
+
+        pending = list(missing.values())
+        batches = [pending[i:i + CROSSREF_BATCH_SIZE] for i in range(0, len(pending), CROSSREF_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+        async def fetch_batch(batch: List[str]) -> None:
+            async with semaphore:
+                try:
+                    found = await self._query_crossref_batch(batch)
+                except Exception as e:
+                    # Leave the batch uncached so the next sync retries it
+                    logger.error(f"Failed to fetch DOI metadata batch: {e}")
+                    results.update((doi.lower(), None) for doi in batch)
+                    return
+            for doi in batch:
+                metadata = found.get(doi.lower())
+                _crossref_cache_put(doi, metadata)
+                results[doi.lower()] = dict(metadata) if metadata else None
+
+        await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        return results
+
+    async def _query_crossref_batch(self, dois: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Works found for the DOIs, keyed by lowercased DOI; raises on failure"""
+        response = await _get_zotero_client().get(
+            "https://api.crossref.org/works",
+            params={
+                "filter": ",".join(f"doi:{doi}" for doi in dois),
+                "rows": len(dois),
+            }
+        )
+        response.raise_for_status()
+
+        requested = {doi.lower(): doi for doi in dois}
+        found = {}
+        data = orjson.loads(response.content)
+        for work in data.get("message", {}).get("items", []):
+            key = work.get("DOI", "").lower()
+            if key in requested:
+                found[key] = _work_to_item(work, requested[key])
+        return found
 
     async def _create_zotero_item(self, item_data: Dict[str, Any], tags: list) -> Optional[str]:
         """Create item in Zotero library."""
+        item_data["tags"] = [{"tag": t} for t in tags]
+        keys = await self._create_zotero_items([item_data])
+        return keys[0]
+
+    async def _create_zotero_items(self, items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create up to ZOTERO_BATCH_SIZE items in one request.
+
+        Returns the new item keys in input order, None where creation failed.
+        """
+        keys: List[Optional[str]] = [None] * len(items)
         if not self.api_key or not self.user_id:
             logger.error("Zotero credentials not configured")
-            return None
-
-        item_data["tags"] = [{"tag": t} for t in tags]
+            return keys
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{ZOTERO_API_BASE}/users/{self.user_id}/items",
-                    headers=self._get_headers(),
-                    json=[item_data],
-                    timeout=30.0
-                )
-
-                if not response.is_success:
-                    logger.error(f"Zotero API error: {response.status_code} - {response.text}")
-                    return None
-
-                result = response.json()
-                successful = result.get("successful", {})
-                if successful:
-                    return list(successful.values())[0].get("key")
-
-                failed = result.get("failed", {})
-                if failed:
-                    logger.error(f"Zotero creation failed: {failed}")
-
-                return None
+            response = await _get_zotero_client().post(
+                f"{ZOTERO_API_BASE}/users/{self.user_id}/items",
+                headers=self._get_headers(),
+                content=orjson.dumps(items)
+            )
+
+            if not response.is_success:
+                logger.error(f"Zotero API error: {response.status_code} - {response.text}")
+                return keys
+
+            result = orjson.loads(response.content)
+            # Results are keyed by the item's index in the request
+            for index, created in result.get("successful", {}).items():
+                keys[int(index)] = created.get("key")
+
+            failed = result.get("failed", {})
+            if failed:
+                logger.error(f"Zotero creation failed: {failed}")
+
+            return keys
         except Exception as e:
             logger.error(f"Failed to create Zotero item: {e}")
-            return None
-
-    async def sync_paper(
-        self,
-        url: str,
-        title: str,
-        doi: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Sync paper to Zotero.
+            return keys
 
-        Returns:
-            Dict with zotero_key and needs_manual flag
-        """
+    def _build_item(self, url: str, title: str, metadata: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], list, bool]:
+        """Zotero item from DOI metadata, or a basic webpage item flagged
+        for manual completion"""
         tags = ["bookmark-manager"]
-        item_data = None
         needs_manual = False
-
-        # Try to get metadata from DOI
-        if doi:
-            item_data = await self._fetch_metadata_by_doi(doi)
+        item_data = metadata
 
         # Fallback to basic item
         if not item_data:
@@ -129,9 +272,108 @@ class ZoteroService:
                 "url": url,
             }
 
+        return item_data, tags, needs_manual
+
+    async def sync_paper(
+        self,
+        url: str,
+        title: str,
+        doi: Optional[str] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Dict[str, Any]:
+        """Sync paper to Zotero.
+
+        With a session, papers already synced (same DOI, or same URL when
+        there is no DOI) return their existing item instead of a new one.
+
+        Returns:
+            Dict with zotero_key and needs_manual flag (and cached on a repeat)
+        """
+        dedup_key = _dedup_key(url, doi)
+        if session is not None:
+            synced = await session.get(ZoteroSync, dedup_key)
+            if synced:
+                return {
+                    "zotero_key": synced.zotero_key,
+                    "needs_manual": synced.needs_manual,
+                    "cached": True,
+                }
+
+        metadata = None
+
+        # Try to get metadata from DOI
+        if doi:
+            metadata = await self._fetch_metadata_by_doi(doi)
+
+        item_data, tags, needs_manual = self._build_item(url, title, metadata)
         zotero_key = await self._create_zotero_item(item_data, tags)
 
+        if session is not None and zotero_key:
+            await _record_synced(session, [
+                {"dedup_key": dedup_key, "zotero_key": zotero_key, "needs_manual": needs_manual}
+            ])
+
         return {
             "zotero_key": zotero_key,
             "needs_manual": needs_manual,
         }
+
+    async def sync_papers(
+        self,
+        papers: List[Tuple[str, str, Optional[str]]],
+        session: Optional[AsyncSession] = None
+    ) -> List[Dict[str, Any]]:
+        """Sync several (url, title, doi) papers to Zotero.
+
+        DOI metadata is fetched in batched CrossRef queries and items are
+        created in batches of ZOTERO_BATCH_SIZE per request. Papers sharing
+        a DOI (or URL) get one item; with a session, papers already synced
+        return their existing item, as in sync_paper.
+
+        Returns:
+            One dict with zotero_key and needs_manual flag per paper, in order
+        """
+        dedup_keys = [_dedup_key(url, doi) for url, _, doi in papers]
+        results: Dict[str, Dict[str, Any]] = {}
+        if session is not None:
+            synced = await session.scalars(
+                select(ZoteroSync).where(ZoteroSync.dedup_key.in_(set(dedup_keys)))
+            )
+            for row in synced:
+                results[row.dedup_key] = {
+                    "zotero_key": row.zotero_key,
+                    "needs_manual": row.needs_manual,
+                    "cached": True,
+                }
+
+        # First paper per key is created; repeats reuse its item
+        pending: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        for key, paper in zip(dedup_keys, papers):
+            if key not in results:
+                pending.setdefault(key, paper)
+
+        metadata = await self._fetch_metadata_by_dois([doi for _, _, doi in pending.values() if doi])
+        built = []
+        for url, title, doi in pending.values():
+            # Each item gets its own copy of the cached metadata
+            meta = metadata.get(doi.lower()) if doi else None
+            built.append(self._build_item(url, title, dict(meta) if meta else None))
+
+        for item_data, tags, _ in built:
+            item_data["tags"] = [{"tag": t} for t in tags]
+
+        keys: List[Optional[str]] = []
+        for start in range(0, len(built), ZOTERO_BATCH_SIZE):
+            batch = [item_data for item_data, _, _ in built[start:start + ZOTERO_BATCH_SIZE]]
+            keys.extend(await self._create_zotero_items(batch))
+
+        for dedup_key, key, (_, _, needs_manual) in zip(pending, keys, built):
+            results[dedup_key] = {"zotero_key": key, "needs_manual": needs_manual}
+
+        if session is not None:
+            await _record_synced(session, [
+                {"dedup_key": dedup_key, **results[dedup_key]}
+                for dedup_key in pending if results[dedup_key]["zotero_key"]
+            ])
+
+        return [dict(results[key]) for key in dedup_keys]
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from markupsafe import Markup
 import bleach
 
@@ -24,6 +26,9 @@ ALLOWED_ATTRIBUTES = {
 ALLOWED_PROTOCOLS = ["http", "https"]
 
 
+# Descriptions repeat across list, detail and feed views; the input string
+# itself is the key, so a hit is always an exact match
+@lru_cache(maxsize=1024)
 def sanitize_html(raw_html: str) -> str:
     """Sanitize HTML with a strict allowlist for safe rendering."""
     if not raw_html:
@@ -1,23 +1,52 @@
 import pytest
+import pytest_asyncio
 import asyncio
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from src import database
+from src.main import app as fastapi_app
 import os
 import tempfile
+from pathlib import Path
 
-# Initialize database immediately when conftest is imported (before test collection)
-# Use a temporary file to ensure proper permissions
-test_db = os.path.join(tempfile.gettempdir(), "test_session_bookmarks.db")
-if os.path.exists(test_db):
-    os.remove(test_db)
+try:
+    import uvloop  # ships with uvicorn[standard]
+except ImportError:
+    uvloop = None
+
+# Use a temporary file to ensure proper permissions; one per xdist worker
+# so parallel runs don't share a database
+worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+test_db = os.path.join(tempfile.gettempdir(), f"test_session_bookmarks_{worker}.db")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--network", action="store_true", help="run tests that reach live services")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip network-marked tests unless --network is given"""
+    if config.getoption("--network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+def remove_test_db():
+    """Remove the database file and its WAL sidecars"""
+    for path in (test_db, f"{test_db}-wal", f"{test_db}-shm"):
+        Path(path).unlink(missing_ok=True)
 
-# Run async init synchronously
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-loop.run_until_complete(database.init_db(f"sqlite+aiosqlite:///{test_db}"))
 
 @pytest.fixture(scope="session", autouse=True)
 def cleanup_test_database():
-    """Cleanup test database after all tests"""
+    """Initialize the test database once per session, clean up afterwards"""
+    remove_test_db()
+    asyncio.run(database.init_db(f"sqlite+aiosqlite:///{test_db}"))
+
     yield
 
     # Cleanup
@@ -25,9 +54,87 @@ def cleanup_test_database():
         if database.engine:
             await database.engine.dispose()
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(cleanup())
+    asyncio.run(cleanup())
+    remove_test_db()
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed"""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app, imported once by conftest"""
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def sync_client(app):
+    """One TestClient for the synchronous UI and feed tests
+
+    Not entered as a context manager, so app startup (init_db against
+    DATABASE_URL, the scheduler) never runs during tests.
+    """
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(app):
+    """One ASGI client shared by every API test"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def wait_for_processing(client):
+    """Poll a bookmark until its background job has filled in the title"""
+    async def wait(bookmark_id: int, timeout: float = 5.0) -> dict:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            bookmark = (await client.get(f"/bookmarks/{bookmark_id}")).json()
+            if bookmark.get("title") is not None or asyncio.get_running_loop().time() >= deadline:
+                return bookmark
+            await asyncio.sleep(0.05)
+
+    return wait
+
+
+@pytest.fixture
+async def mem_db():
+    """Point the app at a fresh in-memory database for one test"""
+    previous = database.engine, database.async_session_maker
+    await database.init_db("sqlite+aiosqlite:///:memory:")
+
+    yield
+
+    await database.engine.dispose()
+    database.engine, database.async_session_maker = previous
+
+
+@pytest.fixture
+async def db_savepoint():
+    """Run one test inside a transaction that is rolled back afterwards
 
-    if os.path.exists(test_db):
-        os.remove(test_db)
+    Sessions join it through savepoints, so their commits are undone too.
+    """
+    previous = database.async_session_maker
+    async with database.engine.connect() as connection:
+        transaction = await connection.begin()
+        # pysqlite defers BEGIN until the first write, which would make the
+        # first session savepoint the outermost one and its release a commit
+        await connection.exec_driver_sql("BEGIN")
+        database.async_session_maker = async_sessionmaker(
+            bind=connection,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield
+        finally:
+            database.async_session_maker = previous
+            await transaction.rollback()
@@ -1,122 +1,113 @@
 import pytest
 from src.services.backup_service import BackupService
-from httpx import AsyncClient
-from src.main import app
 import os
 import sqlite3
-import shutil
 
 
-@pytest.mark.asyncio
-async def test_create_backup():
-    """Test creating a database backup"""
-    service = BackupService(
-        db_path="test_bookmarks.db",
-        backup_dir="test_backups"
-    )
+@pytest.fixture(scope="module")
+def backup_service(tmp_path_factory):
+    """One database and backup dir shared by the backup tests"""
+    root = tmp_path_factory.mktemp("backup")
+    db_path = root / "test_bookmarks.db"
 
-    # Create test database
-    conn = sqlite3.connect("test_bookmarks.db")
-    conn.execute("CREATE TABLE test (id INTEGER)")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE test (id INTEGER, name TEXT)")
+    conn.execute("INSERT INTO test VALUES (1, 'original')")
+    conn.commit()
     conn.close()
 
-    # Create backup
-    backup_path = await service.create_backup()
+    return BackupService(
+        db_path=str(db_path),
+        backup_dir=str(root / "backups"),
+        compresslevel=1
+    )
+
+
+async def test_create_backup(backup_service):
+    """Test creating a database backup"""
+    backup_path = await backup_service.create_backup()
 
     assert os.path.exists(backup_path)
     assert backup_path.endswith(".db.gz")
 
-    # Cleanup
-    os.remove("test_bookmarks.db")
-    if os.path.exists("test_backups"):
-        shutil.rmtree("test_backups")
-
 
-@pytest.mark.asyncio
-async def test_list_backups():
+async def test_list_backups(backup_service):
     """Test listing available backups"""
-    service = BackupService(
-        db_path="test_bookmarks.db",
-        backup_dir="test_backups"
-    )
-
-    # Create test database
-    conn = sqlite3.connect("test_bookmarks.db")
-    conn.execute("CREATE TABLE test (id INTEGER)")
-    conn.close()
+    await backup_service.create_backup()
 
-    # Create a backup
-    await service.create_backup()
-
-    # List backups
-    backups = await service.list_backups()
+    backups = await backup_service.list_backups()
 
     assert len(backups) > 0
     assert "filename" in backups[0]
     assert "size" in backups[0]
     assert "created_at" in backups[0]
 
-    # Cleanup
-    os.remove("test_bookmarks.db")
-    if os.path.exists("test_backups"):
-        shutil.rmtree("test_backups")
 
-
-@pytest.mark.asyncio
-async def test_restore_backup():
+async def test_restore_backup(backup_service):
     """Test restoring from a backup"""
-    service = BackupService(
-        db_path="test_bookmarks.db",
-        backup_dir="test_backups"
-    )
-
-    # Create test database with data
-    conn = sqlite3.connect("test_bookmarks.db")
-    conn.execute("CREATE TABLE test (id INTEGER, name TEXT)")
-    conn.execute("INSERT INTO test VALUES (1, 'original')")
-    conn.commit()
-    conn.close()
-
     # Create backup
-    backup_path = await service.create_backup()
+    backup_path = await backup_service.create_backup()
     backup_filename = os.path.basename(backup_path)
 
     # Modify database
-    conn = sqlite3.connect("test_bookmarks.db")
+    conn = sqlite3.connect(backup_service.db_path)
     conn.execute("UPDATE test SET name = 'modified'")
     conn.commit()
     conn.close()
 
     # Restore backup
-    await service.restore_backup(backup_filename)
+    await backup_service.restore_backup(backup_filename)
 
     # Verify data is restored
-    conn = sqlite3.connect("test_bookmarks.db")
+    conn = sqlite3.connect(backup_service.db_path)
     cursor = conn.execute("SELECT name FROM test WHERE id = 1")
     result = cursor.fetchone()
     conn.close()
 
     assert result[0] == "original"
 
-    # Cleanup
-    os.remove("test_bookmarks.db")
-    if os.path.exists("test_backups"):
-        shutil.rmtree("test_backups")
 
+async def test_restore_visible_to_open_connection(backup_service):
+    """A restore must reach connections the app already holds open"""
+    live = sqlite3.connect(backup_service.db_path)
+    live.execute("PRAGMA journal_mode=WAL")
+    try:
+        backup_path = await backup_service.create_backup()
+
+        live.execute("INSERT INTO test VALUES (2, 'after backup')")
+        live.commit()
+
+        await backup_service.restore_backup(os.path.basename(backup_path))
+
+        rows = live.execute("SELECT id FROM test ORDER BY id").fetchall()
+        assert rows == [(1,)]
+    finally:
+        live.close()
 
-@pytest.mark.asyncio
-async def test_backup_api_endpoints():
+    # Nothing left in the WAL may be replayed over the restore
+    conn = sqlite3.connect(backup_service.db_path)
+    rows = conn.execute("SELECT id FROM test ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [(1,)]
+
+
+async def test_backup_api_endpoints(client, backup_service, monkeypatch):
     """Test backup API endpoints"""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Create backup via API
-        response = await client.post("/backup/create")
-        assert response.status_code == 201
-        data = response.json()
-        assert "path" in data
-        assert "message" in data
-
-        # List backups
-        response = await client.get("/backup/list")
-        assert response.status_code == 200
-        backups = response.json()
-        assert isinstance(backups, list)
+    from src.routers import backup
+
+    # Keep the API off the real data/ directory
+    monkeypatch.setattr(backup, "backup_service", backup_service)
+
+    # Create backup via API
+    response = await client.post("/backup/create")
+    assert response.status_code == 201
+    data = response.json()
+    assert "path" in data
+    assert "message" in data
+
+    # List backups
+    response = await client.get("/backup/list")
+    assert response.status_code == 200
+    backups = response.json()
+    assert isinstance(backups, list)
+    assert len(backups) > 0
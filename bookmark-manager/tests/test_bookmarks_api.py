@@ -1,193 +1,298 @@
 import pytest
-from httpx import AsyncClient, ASGITransport
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
 from src.models import Bookmark, BookmarkState
 from src import database
-from sqlalchemy import select, delete
-from src.main import app
+from sqlalchemy import select
 
 @pytest.fixture(scope="function", autouse=True)
-async def clean_db():
-    """Clean database between tests"""
-    # Clear all bookmarks between tests
-    async with database.async_session_maker() as session:
-        await session.execute(delete(Bookmark))
-        await session.commit()
-
+async def clean_db(db_savepoint):
+    """Roll back each test's writes"""
     yield
 
-@pytest.mark.asyncio
-async def test_create_bookmark():
+
+@pytest.fixture(autouse=True)
+def offline_jobs():
+    """Keep the queued background job off the network"""
+    from src.main import background_job_service
+
+    with patch.object(background_job_service.jina_client, 'extract_metadata', new_callable=AsyncMock) as mock_jina, \
+         patch.object(background_job_service.archive_service, 'submit_to_archive', new_callable=AsyncMock) as mock_archive:
+        mock_jina.return_value = {"title": "Example", "description": "", "content": ""}
+        mock_archive.return_value = {"snapshot_url": "https://web.archive.org/web/2024/https://example.com"}
+        yield
+
+async def test_create_bookmark(client):
     """Test creating a new bookmark"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/bookmarks",
-            json={"url": "https://example.com"}
-        )
-
-        assert response.status_code == 201
-        data = response.json()
-        # Pydantic HttpUrl adds trailing slash
-        assert data["url"] == "https://example.com/" or data["url"] == "https://example.com"
-        assert data["state"] == "inbox"
-
-@pytest.mark.asyncio
-async def test_list_bookmarks():
+    response = await client.post(
+        "/bookmarks",
+        json={"url": "https://example.com"}
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    # Normalized like HttpUrl: bare hosts get a trailing slash
+    assert data["url"] == "https://example.com/"
+    assert data["state"] == "inbox"
+
+async def test_create_bookmark_normalizes_url(client):
+    """Scheme and host case and the bare-host slash don't defeat dedup"""
+    response = await client.post("/bookmarks", json={"url": "HTTPS://Example.com"})
+    assert response.status_code == 201
+    assert response.json()["url"] == "https://example.com/"
+    assert (await client.post("/bookmarks", json={"url": "https://example.com/"})).status_code == 409
+
+async def test_create_bookmark_rejects_non_http_url(client):
+    """Test URLs without an http(s) scheme are rejected"""
+    for url in ["example.com", "ftp://example.com", "https://"]:
+        response = await client.post("/bookmarks", json={"url": url})
+        assert response.status_code == 422
+
+async def test_list_bookmarks(client):
     """Test listing bookmarks"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        # Create bookmark first
-        await client.post("/bookmarks", json={"url": "https://example.com"})
+    # Create bookmark first
+    await client.post("/bookmarks", json={"url": "https://example.com"})
+
+    # List bookmarks
+    response = await client.get("/bookmarks")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) > 0
+
+
+async def test_list_bookmarks_keyset_pagination(client):
+    """Cursor pages cover every bookmark exactly once, newest first"""
+    from urllib.parse import parse_qsl
 
-        # List bookmarks
-        response = await client.get("/bookmarks")
+    # Inserted in one second, so only the id tiebreaker orders them
+    async with database.async_session_maker() as session:
+        session.add_all([Bookmark(url=f"https://example.com/page/{i}") for i in range(5)])
+        await session.commit()
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/bookmarks", params=params)
         assert response.status_code == 200
-        data = response.json()
-        assert len(data) > 0
+        seen.extend(b["url"] for b in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, **dict(parse_qsl(cursor))}
 
+    assert seen == [f"https://example.com/page/{i}" for i in reversed(range(5))]
 
-@pytest.mark.asyncio
-async def test_get_recently_archived():
-    """Should return recently archived bookmarks"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/bookmarks/recently-archived")
+    response = await client.get("/bookmarks", params={"before_id": 1})
+    assert response.status_code == 400
+
+
+
+async def test_keyset_cursor_round_trips_stored_timestamps(client):
+    """Cursors from naive microsecond, whole-second and default rows compare
+    exactly against stored added_at, and a stale offset is ignored"""
+    from urllib.parse import parse_qsl
+
+    with_micros = datetime(2026, 1, 1, 10, 0, 0, 123456)
+    whole_second = datetime(2026, 1, 1, 10, 0, 0)
+    async with database.async_session_maker() as session:
+        session.add_all([
+            Bookmark(url="https://example.com/micros/0", added_at=with_micros),
+            Bookmark(url="https://example.com/micros/1", added_at=with_micros),
+            Bookmark(url="https://example.com/whole/0", added_at=whole_second),
+            Bookmark(url="https://example.com/whole/1", added_at=whole_second),
+            Bookmark(url="https://example.com/default"),
+        ])
+        await session.commit()
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/bookmarks", params=params)
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        seen.extend(b["url"] for b in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "offset": 2, **dict(parse_qsl(cursor))}
+
+    assert seen == [
+        "https://example.com/default",
+        "https://example.com/micros/1",
+        "https://example.com/micros/0",
+        "https://example.com/whole/1",
+        "https://example.com/whole/0",
+    ]
+
+    # An aware cursor means the same instant as the stored naive UTC value
+    last_id = max(b["id"] for b in (await client.get("/bookmarks")).json())
+    response = await client.get("/bookmarks", params={
+        "before_added_at": "2026-01-01T11:00:00.123456+01:00",
+        "before_id": last_id,
+    })
+    assert [b["url"] for b in response.json()][:2] == [
+        "https://example.com/micros/1",
+        "https://example.com/micros/0",
+    ]
+
+async def test_get_recently_archived(client):
+    """Should return recently archived bookmarks"""
+    response = await client.get("/bookmarks/recently-archived")
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
 
 
-@pytest.mark.asyncio
-async def test_bookmark_response_has_is_thesis():
+async def test_bookmark_response_has_is_thesis(client):
     """Test that bookmark response includes is_thesis field"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post("/bookmarks", json={"url": "https://example.com/thesis-test"})
-        assert response.status_code == 201
-        data = response.json()
-        assert "is_thesis" in data
-        assert "expires_at" in data
+    response = await client.post("/bookmarks", json={"url": "https://example.com/thesis-test"})
+    assert response.status_code == 201
+    data = response.json()
+    assert "is_thesis" in data
+    assert "expires_at" in data
 
 
-@pytest.mark.asyncio
-async def test_bookmark_expires_in_7_days():
+async def test_bookmark_expires_in_7_days(client, monkeypatch):
     """Regular bookmarks expire in 7 days"""
-    from datetime import datetime, timedelta, timezone
+    from datetime import timedelta
+    from src.routers import bookmarks
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post("/bookmarks", json={"url": "https://example.com/expiry-calc"})
-        assert response.status_code == 201
-        data = response.json()
+    frozen_now = datetime(2025, 1, 1)
 
-        # Parse expires_at - handle Z suffix
-        expires_str = data["expires_at"]
-        if expires_str.endswith("Z"):
-            expires_str = expires_str[:-1] + "+00:00"
-        expires_at = datetime.fromisoformat(expires_str)
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return frozen_now
 
-        # Make expires_at offset-naive for comparison
-        if expires_at.tzinfo is not None:
-            expires_at = expires_at.replace(tzinfo=None)
+    monkeypatch.setattr(bookmarks, "datetime", FrozenDatetime)
 
-        expected = datetime.utcnow() + timedelta(days=7)
+    response = await client.post("/bookmarks", json={"url": "https://example.com/expiry-calc"})
+    assert response.status_code == 201
 
-        # Within 5 minutes of expected (test takes ~3 min due to archive timeouts)
-        assert abs((expires_at - expected).total_seconds()) < 300
+    expires_at = datetime.fromisoformat(response.json()["expires_at"])
+    assert expires_at == frozen_now + timedelta(days=7)
 
 
-@pytest.mark.asyncio
-async def test_pin_clears_expiry():
+async def test_pin_clears_expiry(client):
     """Pinning a bookmark should clear its expiry"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        create_resp = await client.post("/bookmarks", json={"url": "https://example.com/pin-expiry"})
-        data = create_resp.json()
-        bookmark_id = data["id"]
+    create_resp = await client.post("/bookmarks", json={"url": "https://example.com/pin-expiry"})
+    data = create_resp.json()
+    bookmark_id = data["id"]
 
-        # Initially has expiry
-        assert data["expires_at"] is not None
+    # Initially has expiry
+    assert data["expires_at"] is not None
 
-        # Pin it
-        response = await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": True})
-        assert response.status_code == 200
-        assert response.json()["expires_at"] is None
+    # Pin it
+    response = await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": True})
+    assert response.status_code == 200
+    assert response.json()["expires_at"] is None
+
+
+async def test_unpin_restores_expiry_unless_thesis(client):
+    """Unpinning restores the 7-day expiry only for non-thesis bookmarks"""
+    create_resp = await client.post("/bookmarks", json={"url": "https://example.com/unpin-expiry"})
+    bookmark_id = create_resp.json()["id"]
+
+    await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": True})
+    response = await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": False})
+    assert response.status_code == 200
+    assert response.json()["pinned"] is False
+    assert response.json()["expires_at"] is not None
 
+    # Thesis items stay protected after unpinning
+    await client.patch(f"/bookmarks/{bookmark_id}/thesis", json={"is_thesis": True})
+    await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": True})
+    response = await client.patch(f"/bookmarks/{bookmark_id}/pin", json={"pinned": False})
+    assert response.json()["expires_at"] is None
 
-@pytest.mark.asyncio
-async def test_toggle_thesis_clears_expiry():
+
+async def test_update_bookmark_description(client):
+    """Updating the description returns the updated bookmark"""
+    create_resp = await client.post("/bookmarks", json={"url": "https://example.com/describe"})
+    bookmark_id = create_resp.json()["id"]
+
+    response = await client.patch(
+        f"/bookmarks/{bookmark_id}/description",
+        json={"description": "New description"}
+    )
+    assert response.status_code == 200
+    assert response.json()["description"] == "New description"
+
+    response = await client.patch("/bookmarks/999999/description", json={"description": "x"})
+    assert response.status_code == 404
+
+
+async def test_toggle_thesis_clears_expiry(client):
     """Marking as thesis should clear expiry"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        create_resp = await client.post("/bookmarks", json={"url": "https://example.com/thesis-expiry"})
-        data = create_resp.json()
-        bookmark_id = data["id"]
+    create_resp = await client.post("/bookmarks", json={"url": "https://example.com/thesis-expiry"})
+    data = create_resp.json()
+    bookmark_id = data["id"]
 
-        # Initially has expiry (not detected as thesis)
-        assert data["expires_at"] is not None
+    # Initially has expiry (not detected as thesis)
+    assert data["expires_at"] is not None
 
-        # Mark as thesis
-        response = await client.patch(f"/bookmarks/{bookmark_id}/thesis", json={"is_thesis": True})
-        assert response.status_code == 200
-        assert response.json()["expires_at"] is None
-        assert response.json()["is_thesis"] is True
+    # Mark as thesis
+    response = await client.patch(f"/bookmarks/{bookmark_id}/thesis", json={"is_thesis": True})
+    assert response.status_code == 200
+    assert response.json()["expires_at"] is None
+    assert response.json()["is_thesis"] is True
 
 
-@pytest.mark.asyncio
-async def test_list_bookmarks_by_view():
+async def test_list_bookmarks_by_view(client):
     """Test view filter parameter"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        # Create regular inbox bookmark
-        inbox_resp = await client.post("/bookmarks", json={"url": "https://example.com/inbox-item-view"})
-        inbox_id = inbox_resp.json()["id"]
-
-        # Create and mark as thesis
-        thesis_resp = await client.post("/bookmarks", json={"url": "https://example.com/thesis-item-view"})
-        thesis_id = thesis_resp.json()["id"]
-        await client.patch(f"/bookmarks/{thesis_id}/thesis", json={"is_thesis": True})
-
-        # Create and pin
-        pin_resp = await client.post("/bookmarks", json={"url": "https://example.com/pinned-item-view"})
-        pin_id = pin_resp.json()["id"]
-        await client.patch(f"/bookmarks/{pin_id}/pin", json={"pinned": True})
-
-        # Test inbox view (excludes thesis and pinned)
-        inbox_list = await client.get("/bookmarks?view=inbox")
-        inbox_urls = [b["url"] for b in inbox_list.json()]
-        assert "https://example.com/inbox-item-view" in inbox_urls or "https://example.com/inbox-item-view/" in inbox_urls
-        # Thesis and pinned should not be in inbox view
-        assert not any("thesis-item-view" in url for url in inbox_urls)
-        assert not any("pinned-item-view" in url for url in inbox_urls)
-
-        # Test thesis view
-        thesis_list = await client.get("/bookmarks?view=thesis")
-        thesis_urls = [b["url"] for b in thesis_list.json()]
-        assert any("thesis-item-view" in url for url in thesis_urls)
-
-        # Test pins view
-        pins_list = await client.get("/bookmarks?view=pins")
-        pins_urls = [b["url"] for b in pins_list.json()]
-        assert any("pinned-item-view" in url for url in pins_urls)
-
-
-@pytest.mark.asyncio
-async def test_export_bookmark():
+    # Create regular inbox bookmark
+    inbox_resp = await client.post("/bookmarks", json={"url": "https://example.com/inbox-item-view"})
+    inbox_id = inbox_resp.json()["id"]
+
+    # Create and mark as thesis
+    thesis_resp = await client.post("/bookmarks", json={"url": "https://example.com/thesis-item-view"})
+    thesis_id = thesis_resp.json()["id"]
+    await client.patch(f"/bookmarks/{thesis_id}/thesis", json={"is_thesis": True})
+
+    # Create and pin
+    pin_resp = await client.post("/bookmarks", json={"url": "https://example.com/pinned-item-view"})
+    pin_id = pin_resp.json()["id"]
+    await client.patch(f"/bookmarks/{pin_id}/pin", json={"pinned": True})
+
+    # Test inbox view (excludes thesis and pinned)
+    inbox_list = await client.get("/bookmarks?view=inbox")
+    inbox_urls = [b["url"] for b in inbox_list.json()]
+    assert "https://example.com/inbox-item-view" in inbox_urls or "https://example.com/inbox-item-view/" in inbox_urls
+    # Thesis and pinned should not be in inbox view
+    assert not any("thesis-item-view" in url for url in inbox_urls)
+    assert not any("pinned-item-view" in url for url in inbox_urls)
+
+    # Test thesis view
+    thesis_list = await client.get("/bookmarks?view=thesis")
+    thesis_urls = [b["url"] for b in thesis_list.json()]
+    assert any("thesis-item-view" in url for url in thesis_urls)
+
+    # Test pins view
+    pins_list = await client.get("/bookmarks?view=pins")
+    pins_urls = [b["url"] for b in pins_list.json()]
+    assert any("pinned-item-view" in url for url in pins_urls)
+
+
+async def test_export_bookmark(client):
     """Test export endpoint returns full bookmark data"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        create_resp = await client.post("/bookmarks", json={"url": "https://example.com/export-test"})
-        bookmark_id = create_resp.json()["id"]
+    create_resp = await client.post("/bookmarks", json={"url": "https://example.com/export-test"})
+    bookmark_id = create_resp.json()["id"]
 
-        response = await client.get(f"/bookmarks/{bookmark_id}/export")
-        assert response.status_code == 200
-        data = response.json()
+    response = await client.get(f"/bookmarks/{bookmark_id}/export")
+    assert response.status_code == 200
+    data = response.json()
 
-        assert "url" in data
-        assert "title" in data
-        assert "description" in data
-        assert "content" in data
-        assert "video_id" in data
+    assert "url" in data
+    assert "title" in data
+    assert "description" in data
+    assert "content" in data
+    assert "video_id" in data
 
 
-@pytest.mark.asyncio
-async def test_expiring_bookmarks():
+async def test_expiring_bookmarks(client):
     """Test endpoint to list bookmarks expiring soon"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        # Create a bookmark (will have 7-day expiry)
-        await client.post("/bookmarks", json={"url": "https://example.com/expiring-soon"})
+    # Create a bookmark (will have 7-day expiry)
+    await client.post("/bookmarks", json={"url": "https://example.com/expiring-soon"})
 
-        response = await client.get("/bookmarks/expiring")
-        assert response.status_code == 200
-        # Should return list (may be empty if no bookmarks expiring within 24h)
-        assert isinstance(response.json(), list)
+    response = await client.get("/bookmarks/expiring")
+    assert response.status_code == 200
+    # Should return list (may be empty if no bookmarks expiring within 24h)
+    assert isinstance(response.json(), list)
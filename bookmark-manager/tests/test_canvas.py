@@ -1,19 +1,13 @@
 import pytest
 import httpx
-from httpx import AsyncClient, ASGITransport
 from unittest.mock import AsyncMock, patch, MagicMock
 from src.models import Bookmark
 from src import database
-from sqlalchemy import delete
-from src.main import app
 
 
 @pytest.fixture(scope="function", autouse=True)
-async def clean_db():
-    """Clean database between tests"""
-    async with database.async_session_maker() as session:
-        await session.execute(delete(Bookmark))
-        await session.commit()
+async def clean_db(db_savepoint):
+    """Roll back each test's writes"""
     yield
 
 
@@ -32,71 +26,61 @@ async def test_bookmark():
         return bookmark
 
 
-@pytest.mark.asyncio
-async def test_push_quote_to_canvas(test_bookmark):
+async def test_push_quote_to_canvas(client, test_bookmark):
     """Test pushing a quote to Canvas"""
 
-    with patch('src.routers.canvas.httpx.AsyncClient') as mock_client_class:
+    with patch('src.routers.canvas._get_canvas_client') as mock_get_client:
         # Setup mock
         mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.raise_for_status = MagicMock()
         mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
-
-        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post(
-                "/canvas/quotes",
-                json={
-                    "bookmark_id": test_bookmark.id,
-                    "quote": "Test quote from source"
-                }
-            )
+        mock_get_client.return_value = mock_client
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-
-
-@pytest.mark.asyncio
-async def test_push_quote_bookmark_not_found():
-    """Test pushing quote for non-existent bookmark"""
-
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.post(
             "/canvas/quotes",
             json={
-                "bookmark_id": 99999,
-                "quote": "Test quote"
+                "bookmark_id": test_bookmark.id,
+                "quote": "Test quote from source"
             }
         )
 
-        assert response.status_code == 404
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+
+
+async def test_push_quote_bookmark_not_found(client):
+    """Test pushing quote for non-existent bookmark"""
 
+    response = await client.post(
+        "/canvas/quotes",
+        json={
+            "bookmark_id": 99999,
+            "quote": "Test quote"
+        }
+    )
 
-@pytest.mark.asyncio
-async def test_push_quote_canvas_unavailable(test_bookmark):
+    assert response.status_code == 404
+
+
+async def test_push_quote_canvas_unavailable(client, test_bookmark):
     """Test handling when Canvas is unavailable"""
 
-    with patch('src.routers.canvas.httpx.AsyncClient') as mock_client_class:
+    with patch('src.routers.canvas._get_canvas_client') as mock_get_client:
         mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_client.post = AsyncMock(
             side_effect=httpx.RequestError("Connection refused")
         )
-        mock_client_class.return_value = mock_client
-
-        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post(
-                "/canvas/quotes",
-                json={
-                    "bookmark_id": test_bookmark.id,
-                    "quote": "Test quote"
-                }
-            )
-
-            assert response.status_code == 503
+        mock_get_client.return_value = mock_client
+
+        response = await client.post(
+            "/canvas/quotes",
+            json={
+                "bookmark_id": test_bookmark.id,
+                "quote": "Test quote"
+            }
+        )
+
+        assert response.status_code == 503
@@ -1,80 +1,91 @@
-import pytest
 from src import database
 from src.models import Bookmark, BookmarkState
 from sqlalchemy import select
-import os
 
-@pytest.mark.asyncio
-async def test_database_initialization():
+async def test_database_initialization(tmp_path):
     """Test database initializes successfully"""
-    test_db = "test_bookmarks.db"
-    if os.path.exists(test_db):
-        os.remove(test_db)
-
-    try:
-        await database.init_db(f"sqlite:///{test_db}")
-
-        # Should create database file
-        assert os.path.exists(test_db)
-    finally:
-        # Cleanup
-        if os.path.exists(test_db):
-            os.remove(test_db)
-
-@pytest.mark.asyncio
-async def test_bookmark_creation():
+    test_db = tmp_path / "test_bookmarks.db"
+
+    await database.init_db(f"sqlite:///{test_db}")
+
+    # Should create database file
+    assert test_db.exists()
+
+async def test_bookmark_creation(mem_db):
     """Test creating a bookmark"""
-    test_db = "test_bookmarks.db"
-    if os.path.exists(test_db):
-        os.remove(test_db)
-
-    try:
-        await database.init_db(f"sqlite+aiosqlite:///{test_db}")
-
-        async with database.async_session_maker() as session:
-            bookmark = Bookmark(
-                url="https://example.com",
-                title="Example",
-                state=BookmarkState.inbox
-            )
-            session.add(bookmark)
-            await session.commit()
-
-            result = await session.execute(select(Bookmark))
-            saved_bookmark = result.scalar_one()
-
-            assert saved_bookmark.url == "https://example.com"
-            assert saved_bookmark.state == BookmarkState.inbox
-    finally:
-        if os.path.exists(test_db):
-            os.remove(test_db)
-
-
-@pytest.mark.asyncio
-async def test_bookmark_has_expires_at_column():
+    async with database.async_session_maker() as session:
+        bookmark = Bookmark(
+            url="https://example.com",
+            title="Example",
+            state=BookmarkState.inbox
+        )
+        session.add(bookmark)
+        await session.commit()
+
+        result = await session.execute(select(Bookmark))
+        saved_bookmark = result.scalar_one()
+
+        assert saved_bookmark.url == "https://example.com"
+        assert saved_bookmark.state == BookmarkState.inbox
+
+
+async def test_bookmark_has_expires_at_column(mem_db):
     """Test that bookmark model has expires_at column"""
     from datetime import datetime, timedelta
 
-    test_db = "test_bookmarks.db"
-    if os.path.exists(test_db):
-        os.remove(test_db)
-
-    try:
-        await database.init_db(f"sqlite+aiosqlite:///{test_db}")
-
-        async with database.async_session_maker() as session:
-            expires = datetime.utcnow() + timedelta(days=7)
-            bookmark = Bookmark(
-                url="https://example.com/expiry-test",
-                state=BookmarkState.inbox,
-                expires_at=expires
-            )
-            session.add(bookmark)
-            await session.commit()
-            await session.refresh(bookmark)
-
-            assert bookmark.expires_at is not None
-            assert abs((bookmark.expires_at - expires).total_seconds()) < 1
-    finally:
-        if os.path.exists(test_db):
-            os.remove(test_db)
+    async with database.async_session_maker() as session:
+        expires = datetime.utcnow() + timedelta(days=7)
+        bookmark = Bookmark(
+            url="https://example.com/expiry-test",
+            state=BookmarkState.inbox,
+            expires_at=expires
+        )
+        session.add(bookmark)
+        await session.commit()
+        await session.refresh(bookmark)
+
+        assert bookmark.expires_at is not None
+        assert abs((bookmark.expires_at - expires).total_seconds()) < 1
+
+async def test_sqlite_uses_wal(tmp_path):
+    """Test connections are configured for WAL mode"""
+    from sqlalchemy import text
+
+    await database.init_db(f"sqlite+aiosqlite:///{tmp_path / 'wal.db'}")
+
+    async with database.async_session_maker() as session:
+        journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+        synchronous = (await session.execute(text("PRAGMA synchronous"))).scalar()
+        temp_store = (await session.execute(text("PRAGMA temp_store"))).scalar()
+        cache_size = (await session.execute(text("PRAGMA cache_size"))).scalar()
+        busy_timeout = (await session.execute(text("PRAGMA busy_timeout"))).scalar()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert temp_store == 2  # MEMORY
+    assert cache_size == -20000
+    assert busy_timeout == 5000  # sqlite3's default 5s connect timeout
+
+async def test_init_db_indexes_existing_bookmarks_for_search(tmp_path):
+    """Databases created before the FTS index get it, filled, on startup"""
+    import sqlite3
+    from src.services.search_service import SearchService
+
+    db_path = tmp_path / "legacy.db"
+    await database.init_db(f"sqlite+aiosqlite:///{db_path}")
+    await database.engine.dispose()
+
+    # Simulate a deployment from before the index existed
+    conn = sqlite3.connect(db_path)
+    for trigger in ("bookmarks_fts_ai", "bookmarks_fts_ad", "bookmarks_fts_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE bookmarks_fts")
+    conn.execute("INSERT INTO bookmarks (url, title, state, added_at) VALUES ('https://old.example.com', 'Legacy page', 'inbox', '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    await database.init_db(f"sqlite+aiosqlite:///{db_path}")
+    async with database.async_session_maker() as session:
+        results = await SearchService().keyword_search("legacy", session)
+
+    assert [b.url for b in results] == ["https://old.example.com"]
@@ -1,9 +1,21 @@
 import pytest
+from functools import lru_cache
 from src.services.embedding_service import EmbeddingService
 
-def test_embedding_generation():
-    """Test embedding generation from text"""
+
+@pytest.fixture(scope="module")
+def service():
+    """One service per module so the model is loaded once
+
+    The model is deterministic, so repeated texts reuse their embedding.
+    """
     service = EmbeddingService()
+    service.generate_embedding = lru_cache(maxsize=64)(service.generate_embedding)
+    return service
+
+
+def test_embedding_generation(service):
+    """Test embedding generation from text"""
     text = "This is a test article about technology"
 
     embedding = service.generate_embedding(text)
@@ -11,10 +23,8 @@ def test_embedding_generation():
     assert len(embedding) == service.embedding_dimension
     assert all(isinstance(x, float) for x in embedding)
 
-def test_embedding_similarity():
+def test_embedding_similarity(service):
     """Test embedding similarity calculation"""
-    service = EmbeddingService()
-
     text1 = "Python programming language"
     text2 = "Python coding and development"
     text3 = "Cooking recipes for dinner"
@@ -29,34 +39,29 @@ def test_embedding_similarity():
 
     assert sim_12 > sim_13
 
-def test_empty_string_input():
+def test_empty_string_input(service):
     """Test embedding generation with empty string"""
-    service = EmbeddingService()
     embedding = service.generate_embedding("")
 
     # Should return zero vector with correct dimension
     assert len(embedding) == service.embedding_dimension
     assert all(x == 0.0 for x in embedding)
 
-def test_whitespace_only_input():
+def test_whitespace_only_input(service):
     """Test embedding generation with whitespace-only string"""
-    service = EmbeddingService()
     embedding = service.generate_embedding("   \t\n  ")
 
     # Should return zero vector with correct dimension
     assert len(embedding) == service.embedding_dimension
     assert all(x == 0.0 for x in embedding)
 
-def test_none_input():
+def test_none_input(service):
     """Test that None input raises ValueError"""
-    service = EmbeddingService()
-
     with pytest.raises(ValueError, match="Text parameter cannot be None"):
         service.generate_embedding(None)
 
-def test_identical_vectors():
+def test_identical_vectors(service):
     """Test cosine similarity of identical vectors"""
-    service = EmbeddingService()
     text = "Test text"
     emb = service.generate_embedding(text)
 
@@ -65,9 +70,8 @@ def test_identical_vectors():
     # Identical vectors should have similarity of 1.0
     assert abs(similarity - 1.0) < 1e-6
 
-def test_zero_vectors():
+def test_zero_vectors(service):
     """Test cosine similarity of zero vectors"""
-    service = EmbeddingService()
     zero_vec = [0.0] * service.embedding_dimension
 
     similarity = service.cosine_similarity(zero_vec, zero_vec)
@@ -75,18 +79,16 @@ def test_zero_vectors():
     # Zero vectors should have similarity of 0.0
     assert similarity == 0.0
 
-def test_wrong_length_vectors():
+def test_wrong_length_vectors(service):
     """Test that vectors of different lengths raise ValueError"""
-    service = EmbeddingService()
     vec1 = [1.0, 2.0, 3.0]
     vec2 = [1.0, 2.0]
 
     with pytest.raises(ValueError, match="Vectors must have same length"):
         service.cosine_similarity(vec1, vec2)
 
-def test_none_vector_input():
+def test_none_vector_input(service):
     """Test that None vectors raise ValueError"""
-    service = EmbeddingService()
     vec = [1.0, 2.0, 3.0]
 
     with pytest.raises(ValueError, match="Vectors cannot be None"):
@@ -95,9 +97,8 @@ def test_none_vector_input():
     with pytest.raises(ValueError, match="Vectors cannot be None"):
         service.cosine_similarity(vec, None)
 
-def test_non_list_vector_input():
+def test_non_list_vector_input(service):
     """Test that non-list vectors raise ValueError"""
-    service = EmbeddingService()
     vec = [1.0, 2.0, 3.0]
 
     with pytest.raises(ValueError, match="Vectors must be lists"):
@@ -106,9 +107,7 @@ def test_non_list_vector_input():
     with pytest.raises(ValueError, match="Vectors must be lists"):
         service.cosine_similarity(vec, (1.0, 2.0, 3.0))
 
-def test_empty_vectors():
+def test_empty_vectors(service):
     """Test that empty vectors raise ValueError"""
-    service = EmbeddingService()
-
     with pytest.raises(ValueError, match="Vectors cannot be empty"):
         service.cosine_similarity([], [])
@@ -1,48 +1,41 @@
 import pytest
 from datetime import datetime, timedelta
-
-
-@pytest.mark.asyncio
-async def test_expire_old_bookmarks():
-    """Test that expired bookmarks are deleted"""
-    from src import database
-    from src.models import Bookmark, BookmarkState
-    from src.services.expiry_service import expire_old_bookmarks
-    from sqlalchemy import select, delete
-
-    # Clean up first
-    async with database.async_session_maker() as session:
-        await session.execute(delete(Bookmark))
-        await session.commit()
-
+from sqlalchemy import insert, select
+from src import database
+from src.models import Bookmark, BookmarkState
+from src.services.expiry_service import expire_old_bookmarks
+
+
+@pytest.mark.parametrize("expires_in, should_expire", [
+    (timedelta(hours=-1), True),
+    # Bookmarks expiring later the same day must not be deleted early
+    (timedelta(minutes=5), False),
+    (timedelta(days=7), False),
+], ids=["expired", "later-today", "next-week"])
+async def test_expire_old_bookmarks(mem_db, expires_in, should_expire):
+    """Test that only bookmarks past their expiry are deleted"""
     async with database.async_session_maker() as session:
-        # Create expired bookmark
-        expired = Bookmark(
-            url="https://example.com/expired",
-            state=BookmarkState.inbox,
-            expires_at=datetime.utcnow() - timedelta(hours=1)
-        )
-        # Create non-expired bookmark
-        valid = Bookmark(
-            url="https://example.com/valid",
-            state=BookmarkState.inbox,
-            expires_at=datetime.utcnow() + timedelta(days=7)
-        )
-        session.add_all([expired, valid])
+        # One bookmark under test, one pinned (never expires)
+        await session.execute(insert(Bookmark), [
+            {
+                "url": "https://example.com/under-test",
+                "state": BookmarkState.inbox,
+                "expires_at": datetime.utcnow() + expires_in,
+            },
+            {
+                "url": "https://example.com/pinned",
+                "state": BookmarkState.inbox,
+                "pinned": True,
+                "expires_at": None,
+            },
+        ])
         await session.commit()
 
-        expired_id = expired.id
-        valid_id = valid.id
-
         # Run expiry
         deleted_count = await expire_old_bookmarks(session)
 
-        assert deleted_count == 1
-
-        # Verify expired is gone
-        result = await session.get(Bookmark, expired_id)
-        assert result is None
+        remaining = set((await session.scalars(select(Bookmark.url))).all())
 
-        # Verify valid still exists
-        result = await session.get(Bookmark, valid_id)
-        assert result is not None
+    assert deleted_count == int(should_expire)
+    assert "https://example.com/pinned" in remaining
+    assert ("https://example.com/under-test" in remaining) is not should_expire
@@ -1,27 +1,178 @@
 # tests/test_feeds.py
-import pytest
-from fastapi.testclient import TestClient
-from src.main import app
 
-client = TestClient(app)
 
-
-def test_feeds_ui_returns_html():
+def test_feeds_ui_returns_html(sync_client):
     """Feeds view should return HTML page"""
-    response = client.get("/ui/?view=feeds")
+    response = sync_client.get("/ui/?view=feeds")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
-    assert "Feeds" in response.text
+    assert b"Feeds" in response.content
 
 
-def test_list_feeds_empty():
+def test_list_feeds_empty(sync_client):
     """List feeds should return empty list initially"""
-    response = client.get("/feeds")
+    response = sync_client.get("/feeds")
     assert response.status_code == 200
     assert response.json() == []
 
 
-def test_create_feed_invalid_url():
+def test_create_feed_invalid_url(sync_client):
     """Creating feed with invalid RSS should fail"""
-    response = client.post("/feeds", json={"url": "https://example.com/not-a-feed"})
+    response = sync_client.post("/feeds", json={"url": "https://example.com/not-a-feed"})
     assert response.status_code == 400
+
+
+async def test_save_feed_items_batch_reuses_existing_bookmarks(client):
+    """Batch save should insert new bookmarks and return existing ones by URL"""
+    from sqlalchemy import delete
+    from src import database
+    from src.models import Feed, FeedItem, Bookmark
+
+    async with database.async_session_maker() as session:
+        feed = Feed(url="https://example.com/batch-feed.xml", title="Batch")
+        session.add(feed)
+        await session.flush()
+        items = [
+            FeedItem(feed_id=feed.id, guid=f"g{i}", url=f"https://example.com/batch/{i}", title=f"Item {i}")
+            for i in range(3)
+        ]
+        session.add_all(items)
+        session.add(Bookmark(url="https://example.com/batch/0", title="Already saved"))
+        await session.commit()
+        feed_id = feed.id
+        item_ids = [item.id for item in items]
+
+    try:
+        response = await client.post(f"/feeds/{feed_id}/items/save-batch", json={"item_ids": item_ids})
+        assert response.status_code == 200
+        data = response.json()
+        assert [b["url"] for b in data] == [f"https://example.com/batch/{i}" for i in range(3)]
+        assert data[0]["title"] == "Already saved"
+        assert data[1]["title"] == "Item 1"
+
+        # Single save returns the bookmark created by the batch
+        response = await client.post(f"/feeds/{feed_id}/items/{item_ids[1]}/save")
+        assert response.json()["id"] == data[1]["id"]
+
+        response = await client.post(f"/feeds/{feed_id}/items/save-batch", json={"item_ids": [999999]})
+        assert response.status_code == 404
+    finally:
+        async with database.async_session_maker() as session:
+            await session.execute(delete(Bookmark).where(Bookmark.url.like("https://example.com/batch/%")))
+            await session.execute(delete(Feed).where(Feed.id == feed_id))
+            await session.execute(delete(FeedItem).where(FeedItem.feed_id == feed_id))
+            await session.commit()
+
+
+async def test_list_feeds_groups_recent_items_per_feed(client):
+    """Each feed lists only its own items from the last 24 hours"""
+    from datetime import datetime, timedelta
+    from sqlalchemy import delete
+    from src import database
+    from src.models import Feed, FeedItem
+
+    now = datetime.utcnow()
+    async with database.async_session_maker() as session:
+        busy = Feed(url="https://example.com/busy.xml", title="Busy")
+        quiet = Feed(url="https://example.com/quiet.xml", title="Quiet")
+        session.add_all([busy, quiet])
+        await session.flush()
+        session.add_all([
+            FeedItem(feed_id=busy.id, guid="new", url="https://example.com/new", published_at=now - timedelta(hours=1)),
+            FeedItem(feed_id=busy.id, guid="newer", url="https://example.com/newer", published_at=now),
+            FeedItem(feed_id=busy.id, guid="old", url="https://example.com/old", published_at=now - timedelta(days=2)),
+        ])
+        await session.commit()
+        feed_ids = [busy.id, quiet.id]
+
+    try:
+        response = await client.get("/feeds")
+        assert response.status_code == 200
+        feeds = {f["title"]: f for f in response.json()}
+        assert [i["url"] for i in feeds["Busy"]["items"]] == [
+            "https://example.com/newer", "https://example.com/new"
+        ]
+        assert feeds["Quiet"]["items"] == []
+    finally:
+        async with database.async_session_maker() as session:
+            await session.execute(delete(FeedItem).where(FeedItem.feed_id.in_(feed_ids)))
+            await session.execute(delete(Feed).where(Feed.id.in_(feed_ids)))
+            await session.commit()
+
+
+async def test_feeds_ui_cached_section_updates_after_dismiss(client):
+    """Cached feed sections must not keep showing dismissed items"""
+    from datetime import datetime
+    from sqlalchemy import delete
+    from src import database
+    from src.models import Feed, FeedItem
+
+    async with database.async_session_maker() as session:
+        feed = Feed(url="https://example.com/cached.xml", title="Cached")
+        session.add(feed)
+        await session.flush()
+        item = FeedItem(feed_id=feed.id, guid="c1", url="https://example.com/c1",
+                        title="Dismiss me", published_at=datetime.utcnow())
+        session.add(item)
+        await session.commit()
+        feed_id, item_id = feed.id, item.id
+
+    try:
+        assert b"Dismiss me" in (await client.get("/ui/?view=feeds")).content
+        await client.delete(f"/feeds/{feed_id}/items/{item_id}")
+        assert b"Dismiss me" not in (await client.get("/ui/?view=feeds")).content
+    finally:
+        async with database.async_session_maker() as session:
+            await session.execute(delete(Feed).where(Feed.id == feed_id))
+            await session.commit()
+
+
+def test_entry_published_at_fallbacks():
+    """Publish dates fall back to updated, then to the raw date string"""
+    import time
+    from datetime import datetime
+    from src.services.feed_service import entry_published_at
+
+    parsed = time.strptime("2026-10-12 10:00", "%Y-%m-%d %H:%M")
+    assert entry_published_at({"published_parsed": parsed}) == datetime(2026, 10, 12, 10, 0)
+    assert entry_published_at({"updated_parsed": parsed}) == datetime(2026, 10, 12, 10, 0)
+    assert entry_published_at({"published": "Mon, 12 Oct 2026 10:00:00 +0200"}) == datetime(2026, 10, 12, 8, 0)
+    assert entry_published_at({"published": "2026-10-12T10:00:00+02:00"}) == datetime(2026, 10, 12, 8, 0)
+    assert entry_published_at({"published": "not a date"}) is None
+
+
+def test_extract_items_skips_entries_without_guid():
+    """Entries become plain tuples; guid falls back to link, then title"""
+    from src.services.feed_service import extract_items
+
+    items = extract_items([
+        {"id": "a", "link": "https://example.com/a", "title": "A", "summary": "S"},
+        {"link": "https://example.com/b", "title": "B", "description": "D"},
+        {"title": "C"},
+        {"summary": "no guid at all"},
+    ])
+
+    assert items == [
+        ("a", "https://example.com/a", "A", "S", None),
+        ("https://example.com/b", "https://example.com/b", "B", "D", None),
+        ("C", "", "C", None, None),
+    ]
+
+
+def test_parsed_feed_cache_is_bounded():
+    """Only the latest parse per feed is kept, oldest feeds evicted first"""
+    from src.services.feed_service import FeedService
+
+    service = FeedService()
+    service._parsed_cache_size = 2
+
+    service._parsed_cache_put("https://a.example.com/rss", b"v1", {"v": 1})
+    service._parsed_cache_put("https://a.example.com/rss", b"v2", {"v": 2})
+    service._parsed_cache_put("https://b.example.com/rss", b"v1", {"v": 1})
+    service._parsed_cache_put("https://c.example.com/rss", b"v1", {"v": 1})
+
+    assert list(service._parsed_cache) == ["https://b.example.com/rss", "https://c.example.com/rss"]
+    assert service._parsed_cache_get("https://c.example.com/rss", b"v1") == {"v": 1}
+    # A changed body drops the stale parse
+    assert service._parsed_cache_get("https://c.example.com/rss", b"v2") is None
+    assert "https://c.example.com/rss" not in service._parsed_cache
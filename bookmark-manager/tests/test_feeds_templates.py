@@ -1,8 +1,15 @@
+from functools import lru_cache
 from pathlib import Path
 
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "src" / "templates"
+
+
+@lru_cache(maxsize=None)
+def _template(name: str) -> str:
+    return (TEMPLATES_DIR / name).read_text(encoding="utf-8")
+
 
 def test_feeds_template_includes_script_once():
     """Prevent duplicate feed scripts that double-submit POST /feeds."""
-    templates_dir = Path(__file__).resolve().parents[1] / "src" / "templates"
-    content = (templates_dir / "feeds.html").read_text(encoding="utf-8")
+    content = _template("feeds.html")
     assert '{% include "_scripts_feeds.html" %}' not in content
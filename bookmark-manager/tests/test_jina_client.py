@@ -1,9 +1,23 @@
 import pytest
-from unittest.mock import AsyncMock, patch
-from src.services.jina_client import JinaClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.services.jina_client import JinaClient, canonicalize_url
 import httpx
 
-@pytest.mark.asyncio
+
+@pytest.fixture
+def mock_client_class():
+    """Patch httpx.AsyncClient; the service's client is its return_value"""
+    client = AsyncMock(spec=httpx.AsyncClient, is_closed=False)
+    with patch("httpx.AsyncClient", return_value=client) as mock_class:
+        yield mock_class
+
+
+@pytest.fixture
+def mock_client(mock_client_class):
+    return mock_client_class.return_value
+
+
+@pytest.mark.network
 async def test_jina_extract_metadata():
     """Test Jina AI metadata extraction"""
     client = JinaClient()
@@ -13,35 +27,27 @@ async def test_jina_extract_metadata():
     assert "description" in result
     assert "content" in result
 
-@pytest.mark.asyncio
-async def test_jina_retry_logic():
+async def test_jina_retry_logic(mock_client):
     """Test that retry logic works for transient failures"""
     client = JinaClient(timeout=5.0)
 
-    # Mock the httpx.AsyncClient to simulate transient failures
-    with patch("httpx.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
-
-        # First two attempts fail with network error, third succeeds
-        mock_response = AsyncMock()
-        mock_response.text = "Title: Test Page\n\nMarkdown Content:\nTest description"
-        mock_response.raise_for_status = AsyncMock()
+    # First two attempts fail with network error, third succeeds
+    mock_response = MagicMock()
+    mock_response.text = "Title: Test Page\n\nMarkdown Content:\nTest description"
 
-        mock_client.get = AsyncMock(side_effect=[
-            httpx.NetworkError("Connection failed"),
-            httpx.NetworkError("Connection failed"),
-            mock_response
-        ])
+    mock_client.get.side_effect = [
+        httpx.NetworkError("Connection failed"),
+        httpx.NetworkError("Connection failed"),
+        mock_response
+    ]
 
-        result = await client.extract_metadata("https://example.com")
+    result = await client.extract_metadata("https://example.com")
 
-        # Should succeed after retries
-        assert result["title"] == "Test Page"
-        assert "error_type" not in result
-        assert mock_client.get.call_count == 3
+    # Should succeed after retries
+    assert result["title"] == "Test Page"
+    assert "error_type" not in result
+    assert mock_client.get.call_count == 3
 
-@pytest.mark.asyncio
 async def test_jina_empty_url():
     """Test handling of empty URL"""
     client = JinaClient()
@@ -50,7 +56,6 @@ async def test_jina_empty_url():
     assert result["error_type"] == "validation_error"
     assert result["title"] == "Error"
 
-@pytest.mark.asyncio
 async def test_jina_invalid_url():
     """Test handling of invalid URL format"""
     client = JinaClient()
@@ -70,7 +75,6 @@ async def test_jina_invalid_url():
     assert result["error_type"] == "validation_error"
     assert result["title"] == "Error"
 
-@pytest.mark.asyncio
 async def test_jina_configurable_timeout():
     """Test that timeout is configurable"""
     client = JinaClient(timeout=15.0)
@@ -78,3 +82,82 @@ async def test_jina_configurable_timeout():
 
     client_with_default = JinaClient()
     assert client_with_default.timeout == 30.0
+
+async def test_jina_reuses_client_across_calls(mock_client_class, mock_client):
+    """One client is created and reused until aclose()"""
+    client = JinaClient(api_key="key")
+
+    mock_response = MagicMock()
+    mock_response.text = "Title: Test Page"
+    mock_client.get.return_value = mock_response
+
+    await client.extract_metadata("https://example.com/one")
+    await client.extract_metadata("https://example.com/two")
+
+    assert mock_client_class.call_count == 1
+    assert mock_client_class.call_args.kwargs["headers"] == {"Authorization": "Bearer key"}
+    assert mock_client.get.call_count == 2
+
+    await client.aclose()
+    mock_client.aclose.assert_awaited_once()
+
+def test_jina_backoff_is_jittered_and_capped():
+    """Backoff delays stay within [0, min(base * 2**attempt, max_delay)]"""
+    client = JinaClient()
+
+    for attempt in range(8):
+        bound = min(client.base_delay * (2 ** attempt), client.max_delay)
+        for _ in range(20):
+            assert 0 <= client._compute_backoff(attempt) <= bound
+
+def test_jina_parse_title_description():
+    """Title and description come from the header and first body line"""
+    content = "Title: Page\nURL Source: https://example.com\n\nMarkdown Content:\n[Skip](x)\nFirst paragraph\n\nMore"
+    assert JinaClient._parse_title_description(content) == ("Page", "First paragraph")
+
+    # Heading is the title fallback
+    content = "Markdown Content:\n\n# Heading\n\nBody"
+    assert JinaClient._parse_title_description(content) == ("Heading", "# Heading")
+
+    assert JinaClient._parse_title_description("") == ("", "")
+
+def test_canonicalize_url():
+    """Tracking params, fragment and trailing slash are dropped"""
+    assert canonicalize_url("https://Example.COM/post/?utm_source=x&id=3&fbclid=abc#top") == "https://example.com/post?id=3"
+    assert canonicalize_url("https://example.com/") == "https://example.com"
+    assert canonicalize_url("https://example.com/Case?gclid=1") == "https://example.com/Case"
+
+async def test_jina_caches_by_canonical_url(mock_client):
+    """Tracking-param variants of a URL share one Jina fetch"""
+    client = JinaClient()
+
+    mock_response = MagicMock()
+    mock_response.text = "Title: Cached\n\nMarkdown Content:\nBody"
+    mock_client.get.return_value = mock_response
+
+    first = await client.extract_metadata("https://example.com/post?utm_source=feed")
+    first["title"] = "mutated"
+    second = await client.extract_metadata("https://EXAMPLE.com/post/?fbclid=abc")
+
+    # The original URL is fetched; the canonical form is only the cache key
+    mock_client.get.assert_awaited_once_with("https://r.jina.ai/https://example.com/post?utm_source=feed")
+    assert second["title"] == "Cached"
+
+async def test_jina_cache_skips_empty_content_and_refresh(mock_client):
+    """Empty scrapes are refetched, and refresh bypasses the cache"""
+    client = JinaClient()
+
+    empty = MagicMock()
+    empty.text = ""
+    full = MagicMock()
+    full.text = "Title: Page\n\nMarkdown Content:\nBody"
+    mock_client.get.side_effect = [empty, full, full]
+
+    assert (await client.extract_metadata("https://example.com/spa#/post"))["content"] == ""
+    assert (await client.extract_metadata("https://example.com/spa#/post"))["title"] == "Page"
+    await client.extract_metadata("https://example.com/spa#/post")
+    assert mock_client.get.call_count == 2
+
+    await client.extract_metadata("https://example.com/spa#/post", refresh=True)
+    assert mock_client.get.call_count == 3
+    mock_client.get.assert_awaited_with("https://r.jina.ai/https://example.com/spa#/post")
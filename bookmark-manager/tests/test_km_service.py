@@ -1,10 +1,9 @@
-import pytest
 from unittest.mock import patch, MagicMock
 from src.services.km_service import KmService
 
-def test_km_service_format_note():
+def test_km_service_format_note(tmp_path):
     """KmService should create a properly formatted note"""
-    service = KmService(notes_dir="/tmp/test_notes")
+    service = KmService(notes_dir=str(tmp_path))
 
     note_content = service.format_note(
         title="My Insight",
@@ -28,9 +27,9 @@ Connected to: [[20251218120000]] (continues)
 '''
     assert note_content == expected
 
-def test_km_service_creates_stump_note():
+def test_km_service_creates_stump_note(tmp_path):
     """Stump notes should have no connection"""
-    service = KmService(notes_dir="/tmp/test_notes")
+    service = KmService(notes_dir=str(tmp_path))
 
     note_content = service.format_note(
         title="New Thought",
@@ -44,36 +43,29 @@ def test_km_service_creates_stump_note():
 
     assert "Connected to:" not in note_content
 
-@pytest.mark.asyncio
-async def test_km_service_create_note():
+async def test_km_service_create_note(tmp_path):
     """KmService should create a note file with timestamp-based filename"""
-    import tempfile
-    import os
+    service = KmService(notes_dir=str(tmp_path))
 
-    # Use a temporary directory
-    with tempfile.TemporaryDirectory() as tmpdir:
-        service = KmService(notes_dir=tmpdir)
-
-        km_id = await service.create_note(
-            title="Test Note",
-            quote="Quote",
-            addition="Addition",
-            source_title="Source",
-            source_url="https://example.com",
-            connection_type="stump",
-            connected_to=None
-        )
+    km_id = await service.create_note(
+        title="Test Note",
+        quote="Quote",
+        addition="Addition",
+        source_title="Source",
+        source_url="https://example.com",
+        connection_type="stump",
+        connected_to=None
+    )
 
-        assert km_id is not None
-        # Verify file exists
-        filepath = os.path.join(tmpdir, f"{km_id}.md")
-        assert os.path.exists(filepath)
+    assert km_id is not None
+    # Verify file exists
+    filepath = tmp_path / f"{km_id}.md"
+    assert filepath.exists()
 
-        # Verify content
-        with open(filepath, 'r') as f:
-            content = f.read()
-        assert "# Test Note" in content
-        assert '> "Quote"' in content
-        assert "Addition" in content
-        assert "Source: [Source](https://example.com)" in content
-        assert "Connected to:" not in content
+    # Verify content
+    content = filepath.read_text()
+    assert "# Test Note" in content
+    assert '> "Quote"' in content
+    assert "Addition" in content
+    assert "Source: [Source](https://example.com)" in content
+    assert "Connected to:" not in content
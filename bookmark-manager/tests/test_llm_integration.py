@@ -1,23 +1,18 @@
-import pytest
+import asyncio
 from unittest.mock import AsyncMock, patch
+from src import database
 from src.services.background_jobs import BackgroundJobService
 from src.models import Bookmark
 from sqlalchemy.ext.asyncio import AsyncSession
 
-@pytest.mark.asyncio
-async def test_background_job_with_llm(tmp_path):
+async def test_background_job_with_llm(mem_db):
     """Test full background job flow with LLM summarization"""
-    from src import database
-
-    # Setup test database
-    test_db = tmp_path / "test.db"
-    await database.init_db(f"sqlite+aiosqlite:///{test_db}")
-
     # Create service with mock LLM
     service = BackgroundJobService(oauth_token="test-token")
 
-    # Mock Jina client
-    with patch.object(service.jina_client, 'extract_metadata', new_callable=AsyncMock) as mock_jina:
+    # Mock Jina client (and keep archive.org out of it)
+    with patch.object(service.jina_client, 'extract_metadata', new_callable=AsyncMock) as mock_jina, \
+         patch.object(service.archive_service, 'submit_to_archive', new=AsyncMock(return_value=None)):
         mock_jina.return_value = {
             "title": "Test Article",
             "description": "Short meta description",
@@ -47,3 +42,23 @@ async def test_background_job_with_llm(tmp_path):
                 assert result.title == "Test Article"
                 assert result.description == "This article explains testing best practices. It covers writing good tests with detailed examples."
                 assert result.description != "Short meta description"  # LLM summary used, not Jina
+
+
+async def test_jina_calls_are_bounded():
+    """Concurrent extractions never exceed the Jina semaphore limit"""
+    service = BackgroundJobService()
+    active = 0
+    peak = 0
+
+    async def fake_extract(url, refresh=False):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"title": url}
+
+    with patch.object(service.jina_client, 'extract_metadata', side_effect=fake_extract):
+        await asyncio.gather(*(service._extract_metadata(f"https://example.com/{i}") for i in range(10)))
+
+    assert peak == 4
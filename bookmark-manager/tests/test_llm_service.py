@@ -4,7 +4,6 @@ from src.services.llm_service import LLMService
 from unittest.mock import AsyncMock, patch, MagicMock
 from claude_agent_sdk import AssistantMessage, TextBlock
 
-@pytest.mark.asyncio
 async def test_summarize_content():
     """Test LLM content summarization"""
     service = LLMService(oauth_token="test-token")
@@ -32,7 +31,6 @@ async def test_summarize_content():
         assert summary == "A concise summary about ML."
         assert len(summary) > 0
 
-@pytest.mark.asyncio
 async def test_summarize_empty_content():
     """Test handling of empty content"""
     service = LLMService(oauth_token="test-token")
@@ -58,7 +56,6 @@ def test_missing_oauth_token():
         if old_token:
             os.environ["CLAUDE_CODE_OAUTH_TOKEN"] = old_token
 
-@pytest.mark.asyncio
 async def test_summarize_api_error():
     """Test handling of API errors"""
     service = LLMService(oauth_token="test-token")
@@ -78,3 +75,43 @@ async def test_summarize_api_error():
 
         # Should return empty string on error
         assert summary == ""
+
+async def test_summarize_uses_cache_for_repeat_content():
+    """Test repeated content is summarized only once"""
+    service = LLMService(oauth_token="test-token")
+
+    def mock_query_call(prompt, options):
+        async def mock_async_iter():
+            yield AssistantMessage(content=[TextBlock(text="Cached summary.")], model="haiku")
+        return mock_async_iter()
+
+    with patch('src.services.llm_service.query', side_effect=mock_query_call) as mock_query:
+        first = await service.summarize_content("Same content", "https://example.com/a")
+        second = await service.summarize_content("Same content", "https://example.com/a")
+        mirror = await service.summarize_content("  same\n\nCONTENT ", "https://example.com/a?utm_source=x")
+        other = await service.summarize_content("Different content", "https://example.com/a")
+
+    assert first == second == mirror == other == "Cached summary."
+    assert mock_query.call_count == 2
+
+def test_truncate_to_tokens_budgets_by_script():
+    """ASCII gets ~4 chars per token, other scripts ~1"""
+    from src.services.llm_service import truncate_to_tokens
+
+    assert truncate_to_tokens("a" * 100, max_tokens=10) == "a" * 40
+    assert truncate_to_tokens("漢" * 100, max_tokens=10) == "漢" * 10
+    assert truncate_to_tokens("ab漢cd", max_tokens=10) == "ab漢cd"
+
+async def test_summarize_prompt_is_just_the_page():
+    """Instructions go in the system prompt, the user turn is URL + content"""
+    service = LLMService(oauth_token="test-token")
+
+    with patch('src.services.llm_service.query') as mock_query:
+        async def mock_async_iter():
+            yield AssistantMessage(content=[TextBlock(text="Summary.")], model="haiku")
+
+        mock_query.return_value = mock_async_iter()
+        await service.summarize_content("Page body", "https://example.com/prompt")
+
+    assert mock_query.call_args.kwargs["prompt"] == "URL: https://example.com/prompt\n\nPage body"
+    assert "2-3" in mock_query.call_args.kwargs["options"].system_prompt
@@ -27,6 +27,16 @@ class TestIsAcademicUrl:
     def test_youtube(self):
         assert is_academic_url("https://youtube.com/watch?v=abc123") is False
 
+    def test_subdomain(self):
+        assert is_academic_url("https://www.journals.plos.org/plosone/article") is True
+
+    def test_lookalike_domain(self):
+        assert is_academic_url("https://notnature.com/article") is False
+
+    def test_port_and_userinfo(self):
+        assert is_academic_url("https://user@arxiv.org:443/abs/2301.00001") is True
+        assert is_academic_url("https://example.com?next=https://arxiv.org/") is False
+
 
 class TestExtractDoi:
     def test_doi_org_url(self):
@@ -15,3 +15,13 @@ def test_sanitize_html_allows_basic_tags_and_strips_script():
     assert '<strong>world</strong>' in cleaned
     assert 'href="https://example.com"' in cleaned
     assert 'javascript:' not in cleaned
+
+
+def test_sanitize_html_caches_repeat_input():
+    sanitize_html.cache_clear()
+
+    first = sanitize_html('<p>cached <script>x</script></p>')
+    second = sanitize_html('<p>cached <script>x</script></p>')
+
+    assert first == second
+    assert sanitize_html.cache_info().hits == 1
@@ -1,36 +1,45 @@
-import pytest
-from httpx import AsyncClient
-from src.main import app
-
-@pytest.mark.asyncio
-async def test_semantic_search():
-    """Test semantic search"""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Create test bookmarks
-        await client.post("/bookmarks", json={"url": "https://python.org"})
-
-        # Wait a moment for background processing
-        import asyncio
-        await asyncio.sleep(2)
-
-        # Search
-        response = await client.post(
-            "/search/semantic",
-            json={"query": "python programming", "limit": 10}
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-
-@pytest.mark.asyncio
-async def test_keyword_search():
+async def test_keyword_search(client):
     """Test keyword search"""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Search
-        response = await client.post(
-            "/search/keyword",
-            json={"query": "python", "limit": 10}
-        )
-
-        assert response.status_code == 200
+    # Search
+    response = await client.post(
+        "/search/keyword",
+        json={"query": "python", "limit": 10}
+    )
+
+    assert response.status_code == 200
+
+async def test_keyword_search_full_text_index():
+    """Keyword search follows inserts, updates and deletes through the FTS index"""
+    from sqlalchemy import delete, update
+    from src import database
+    from src.models import Bookmark
+    from src.services.search_service import SearchService
+
+    service = SearchService()
+    async with database.async_session_maker() as session:
+        session.add_all([
+            Bookmark(url="https://fts.example.com/one", title="Rustacean handbook", description="Ownership explained"),
+            Bookmark(url="https://fts.example.com/two", title="Gardening", description="Rustacean-free zone"),
+        ])
+        await session.commit()
+
+        try:
+            results = await service.keyword_search("rustac", session)
+            assert {b.url for b in results} == {"https://fts.example.com/one", "https://fts.example.com/two"}
+
+            results = await service.keyword_search('rustacean "handbook', session)
+            assert [b.url for b in results] == ["https://fts.example.com/one"]
+
+            await session.execute(
+                update(Bookmark).where(Bookmark.url == "https://fts.example.com/one").values(title="Ferris")
+            )
+            await session.commit()
+            results = await service.keyword_search("handbook", session)
+            assert results == []
+
+            assert await service.keyword_search("  ", session) == []
+        finally:
+            await session.execute(delete(Bookmark).where(Bookmark.url.like("https://fts.example.com/%")))
+            await session.commit()
+
+        assert await service.keyword_search("gardening", session) == []
@@ -1,73 +1,87 @@
 # tests/test_ui.py
+import re
 import pytest
-from fastapi.testclient import TestClient
-from src.main import app
 
-client = TestClient(app)
+TAB_LINK_RE = re.compile(rb'href="/ui/\?view=(\w+)"')
 
 
-def test_ui_index_returns_html():
+def test_ui_index_returns_html(sync_client):
     """UI index should return HTML page"""
-    response = client.get("/ui/")
+    response = sync_client.get("/ui/")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
-    assert "Bookmarks" in response.text
+    assert b"Bookmarks" in response.content
 
 
-def test_ui_inbox_view():
+def test_ui_inbox_view(sync_client):
     """Inbox view should show inbox header"""
-    response = client.get("/ui/?view=inbox")
+    response = sync_client.get("/ui/?view=inbox")
     assert response.status_code == 200
-    assert "INBOX" in response.text
+    assert b"INBOX" in response.content
 
 
-def test_ui_thesis_view():
+def test_ui_thesis_view(sync_client):
     """Thesis view should show thesis header"""
-    response = client.get("/ui/?view=thesis")
+    response = sync_client.get("/ui/?view=thesis")
     assert response.status_code == 200
-    assert "THESIS" in response.text
+    assert b"THESIS" in response.content
 
 
-def test_ui_pins_view():
+def test_ui_pins_view(sync_client):
     """Pins view should show pins header"""
-    response = client.get("/ui/?view=pins")
+    response = sync_client.get("/ui/?view=pins")
     assert response.status_code == 200
-    assert "PINS" in response.text
+    assert b"PINS" in response.content
 
 
-def test_ui_inbox_with_thesis_filter():
+def test_ui_inbox_with_thesis_filter(sync_client):
     """Inbox with thesis filter should work"""
-    response = client.get("/ui/?view=inbox&filter=thesis")
+    response = sync_client.get("/ui/?view=inbox&filter=thesis")
     assert response.status_code == 200
 
 
-def test_ui_inbox_with_pin_filter():
+def test_ui_inbox_with_pin_filter(sync_client):
     """Inbox with pin filter should work"""
-    response = client.get("/ui/?view=inbox&filter=pin")
+    response = sync_client.get("/ui/?view=inbox&filter=pin")
     assert response.status_code == 200
 
 
-def test_ui_has_four_tabs():
+def test_ui_has_four_tabs(sync_client):
     """UI should have exactly 4 tabs: Feeds, Inbox, Thesis, Pins"""
-    response = client.get("/ui/")
+    response = sync_client.get("/ui/")
     assert response.status_code == 200
-    assert 'href="/ui/?view=feeds"' in response.text
-    assert 'href="/ui/?view=inbox"' in response.text
-    assert 'href="/ui/?view=thesis"' in response.text
-    assert 'href="/ui/?view=pins"' in response.text
+    tabs = set(TAB_LINK_RE.findall(response.content))
+    assert tabs == {b"feeds", b"inbox", b"thesis", b"pins"}
     # Archive view is removed
-    assert 'view=archive' not in response.text
+    assert b'view=archive' not in response.content
 
 
-def test_ui_inbox_empty_state():
+def test_ui_inbox_empty_state(sync_client):
     """Empty inbox should show INBOX ZERO message"""
-    response = client.get("/ui/?view=inbox")
+    response = sync_client.get("/ui/?view=inbox")
     assert response.status_code == 200
     # Either shows bookmarks or the empty state
-    assert "INBOX" in response.text
+    assert b"INBOX" in response.content
 
 
-def test_ui_filter_icons_present():
+def test_ui_filter_icons_present(sync_client):
     """Filter icons should be present in inbox"""
-    inbox = client.get("/ui/?view=inbox")
-    assert "filter-icon" in inbox.text
+    inbox = sync_client.get("/ui/?view=inbox")
+    assert b"filter-icon" in inbox.content
+
+
+def test_expiry_labels():
+    """Expiry labels are precomputed per bookmark id"""
+    from datetime import datetime, timedelta
+    from types import SimpleNamespace
+    from src.routers.ui import expiry_labels
+
+    now = datetime.utcnow()
+    bookmarks = [
+        SimpleNamespace(id=1, expires_at=now + timedelta(days=5, hours=1)),
+        SimpleNamespace(id=2, expires_at=now + timedelta(hours=3, minutes=1)),
+        SimpleNamespace(id=3, expires_at=now - timedelta(hours=1)),
+        SimpleNamespace(id=4, expires_at=None),
+    ]
+
+    assert expiry_labels(bookmarks) == {1: "5d left", 2: "3h left", 3: "expired", 4: ""}
@@ -1,15 +1,28 @@
 # tests/test_zotero_service.py
+import httpx
+import orjson
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+from src import database
+from src.services import zotero_service as zotero_module
 from src.services.zotero_service import ZoteroService
 
+
+@pytest.fixture(autouse=True)
+async def reset_zotero_module():
+    """Each test starts with an empty CrossRef cache and no shared client"""
+    zotero_module._crossref_cache.clear()
+    await zotero_module.close_zotero_client()
+    yield
+    await zotero_module.close_zotero_client()
+
+
 @pytest.fixture
 def zotero_service():
     return ZoteroService(api_key="test_key", user_id="12345")
 
 
 class TestZoteroService:
-    @pytest.mark.asyncio
     async def test_create_item_with_doi(self, zotero_service):
         with patch.object(zotero_service, '_fetch_metadata_by_doi') as mock_fetch:
             mock_fetch.return_value = {
@@ -29,7 +42,6 @@ class TestZoteroService:
                 assert result["zotero_key"] == "ABC123"
                 assert result["needs_manual"] is False
 
-    @pytest.mark.asyncio
     async def test_create_item_without_doi(self, zotero_service):
         with patch.object(zotero_service, '_create_zotero_item') as mock_create:
             mock_create.return_value = "XYZ789"
@@ -42,3 +54,140 @@ class TestZoteroService:
 
             assert result["zotero_key"] == "XYZ789"
             assert result["needs_manual"] is True
+
+    async def test_requests_share_one_client(self, zotero_service):
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.is_closed = False
+            mock_client_class.return_value = mock_client
+
+            crossref = MagicMock(is_success=True, content=orjson.dumps({"message": {"title": ["Paper"]}}))
+            created = MagicMock(is_success=True, content=orjson.dumps({"successful": {"0": {"key": "KEY1"}}}))
+            mock_client.get = AsyncMock(return_value=crossref)
+            mock_client.post = AsyncMock(return_value=created)
+
+            result = await zotero_service.sync_paper(
+                url="https://doi.org/10.1000/test",
+                title="Paper",
+                doi="10.1000/test"
+            )
+
+            assert result["zotero_key"] == "KEY1"
+            assert mock_client_class.call_count == 1
+            posted = orjson.loads(mock_client.post.call_args.kwargs["content"])
+            assert posted[0]["title"] == "Paper"
+
+            await zotero_module.close_zotero_client()
+            mock_client.aclose.assert_awaited_once()
+
+    async def test_sync_papers_batches_item_creation(self, zotero_service):
+        papers = [(f"https://example.com/{i}", f"Paper {i}", f"10.1000/{i}" if i % 2 else None) for i in range(120)]
+
+        async def fake_batch(dois):
+            return {doi.lower(): {"itemType": "journalArticle", "title": doi} for doi in dois}
+
+        async def fake_create(items):
+            return [f"KEY-{item['title']}" for item in items]
+
+        with patch.object(zotero_service, '_query_crossref_batch', side_effect=fake_batch) as mock_batch, \
+                patch.object(zotero_service, '_create_zotero_items', side_effect=fake_create) as mock_create:
+            results = await zotero_service.sync_papers(papers)
+
+        assert sorted(len(call.args[0]) for call in mock_batch.call_args_list) == [10, 50]
+        assert [len(call.args[0]) for call in mock_create.call_args_list] == [50, 50, 20]
+        assert results[0] == {"zotero_key": "KEY-Paper 0", "needs_manual": True}
+        assert results[1] == {"zotero_key": "KEY-10.1000/1", "needs_manual": False}
+        assert len(results) == 120
+
+    async def test_batch_doi_lookup_matches_results_case_insensitively(self, zotero_service):
+        response = MagicMock(is_success=True, content=orjson.dumps({"message": {"items": [
+            {"DOI": "10.1000/abc", "title": ["Found"]},
+        ]}}))
+
+        with patch.object(zotero_module, "_get_zotero_client") as mock_get_client:
+            mock_get_client.return_value.get = AsyncMock(return_value=response)
+            results = await zotero_service._fetch_metadata_by_dois(["10.1000/ABC", "10.1000/none"])
+
+        params = mock_get_client.return_value.get.call_args.kwargs["params"]
+        assert params["filter"] == "doi:10.1000/ABC,doi:10.1000/none"
+        assert results["10.1000/abc"]["title"] == "Found"
+        assert results["10.1000/abc"]["DOI"] == "10.1000/ABC"
+        assert results["10.1000/none"] is None
+
+    async def test_failed_batch_lookup_is_not_cached(self, zotero_service):
+        ok = MagicMock(is_success=True, content=orjson.dumps({"message": {"items": [
+            {"DOI": "10.1000/abc", "title": ["Found"]},
+        ]}}))
+
+        with patch.object(zotero_module, "_get_zotero_client") as mock_get_client:
+            mock_get_client.return_value.get = AsyncMock(side_effect=[httpx.ConnectError("down"), ok])
+            failed = await zotero_service._fetch_metadata_by_dois(["10.1000/ABC", "10.1000/none"])
+            retried = await zotero_service._fetch_metadata_by_dois(["10.1000/ABC", "10.1000/none"])
+
+        assert failed == {"10.1000/abc": None, "10.1000/none": None}
+        assert retried["10.1000/abc"]["title"] == "Found"
+        # Only the DOI CrossRef returned no work for is negative-cached
+        assert zotero_module._crossref_cache_get("10.1000/none") == (True, None)
+
+    async def test_doi_metadata_is_cached(self, zotero_service):
+        with patch.object(zotero_service, '_query_crossref') as mock_query:
+            mock_query.side_effect = [{"title": "Paper", "DOI": "10.1000/ABC"}, None]
+
+            first = await zotero_service._fetch_metadata_by_doi("10.1000/ABC")
+            first["tags"] = [{"tag": "mutated"}]
+            second = await zotero_service._fetch_metadata_by_doi("10.1000/abc")
+            missing = await zotero_service._fetch_metadata_by_doi("10.1000/missing")
+            missing_again = await zotero_service._fetch_metadata_by_doi("10.1000/missing")
+
+        assert second == {"title": "Paper", "DOI": "10.1000/ABC"}
+        assert missing is None and missing_again is None
+        assert mock_query.call_count == 2
+
+    async def test_repeat_sync_reuses_existing_item(self, zotero_service):
+        async with database.async_session_maker() as session:
+            with patch.object(zotero_service, '_fetch_metadata_by_doi') as mock_fetch, \
+                 patch.object(zotero_service, '_create_zotero_item') as mock_create:
+                mock_fetch.return_value = {"title": "Paper"}
+                mock_create.return_value = "DEDUP1"
+
+                first = await zotero_service.sync_paper(
+                    url="https://arxiv.org/abs/2401.00001", title="Paper",
+                    doi="10.1000/Dedup", session=session
+                )
+                second = await zotero_service.sync_paper(
+                    url="https://arxiv.org/pdf/2401.00001", title="Paper",
+                    doi="10.1000/dedup", session=session
+                )
+
+        assert first["zotero_key"] == second["zotero_key"] == "DEDUP1"
+        assert second["cached"] is True
+        assert mock_create.call_count == 1
+
+    async def test_bulk_sync_skips_papers_already_synced(self, zotero_service, mem_db):
+        async with database.async_session_maker() as session:
+            await zotero_module._record_synced(session, [
+                {"dedup_key": "url:https://example.com/old", "zotero_key": "OLD", "needs_manual": True},
+            ])
+            # A racing sync that already recorded the key is not an error
+            await zotero_module._record_synced(session, [
+                {"dedup_key": "url:https://example.com/old", "zotero_key": "RACE", "needs_manual": True},
+            ])
+
+            papers = [
+                ("https://Example.com/old/?utm_source=feed", "Old", None),
+                ("https://example.com/new", "New", None),
+                ("https://example.com/new/", "New again", None),
+            ]
+            with patch.object(zotero_service, '_create_zotero_items', new=AsyncMock(return_value=["NEW"])) as mock_create:
+                results = await zotero_service.sync_papers(papers, session=session)
+                repeat = await zotero_service.sync_papers(papers, session=session)
+
+        assert results == [
+            {"zotero_key": "OLD", "needs_manual": True, "cached": True},
+            {"zotero_key": "NEW", "needs_manual": True},
+            {"zotero_key": "NEW", "needs_manual": True},
+        ]
+        assert [r["zotero_key"] for r in repeat] == ["OLD", "NEW", "NEW"]
+        # One item for the two spellings of the new URL, none on the repeat
+        assert mock_create.await_count == 1
+        assert len(mock_create.await_args.args[0]) == 1
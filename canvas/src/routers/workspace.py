@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from src.database import get_db
 from src.models import WorkspaceNote, WorkspaceConnection
 from src.schemas import (
@@ -37,16 +37,17 @@ async def get_workspace(session: AsyncSession = Depends(get_db)):
 
 @router.post("/notes", status_code=201, response_model=WorkspaceNoteResponse)
 async def add_note(data: WorkspaceNoteCreate, session: AsyncSession = Depends(get_db)):
-    # Check if note already in workspace
-    existing_check = await session.execute(
-        select(WorkspaceNote).where(WorkspaceNote.km_note_id == data.km_note_id)
+    # Count existing notes for positioning and check for this one in one query
+    result = await session.execute(
+        select(
+            func.count(),
+            func.count().filter(WorkspaceNote.km_note_id == data.km_note_id)
+        ).select_from(WorkspaceNote)
     )
-    if existing_check.scalar_one_or_none():
+    existing, already_added = result.one()
+    if already_added:
         raise HTTPException(status_code=400, detail="Note already in workspace")
 
-    # Count existing notes for positioning
-    result = await session.execute(select(WorkspaceNote))
-    existing = len(result.scalars().all())
     x, y = calculate_position(existing)
 
     note = WorkspaceNote(
@@ -66,3 +66,14 @@ async def test_delete_note(client):
 
     workspace = await client.get("/api/workspace")
     assert len(workspace.json()["notes"]) == 0
+
+@pytest.mark.asyncio
+async def test_add_note_positions_and_rejects_duplicates(client):
+    positions = []
+    for km_id in ["a", "b", "c", "d"]:
+        r = await client.post("/api/workspace/notes", json={"km_note_id": km_id, "content": km_id})
+        positions.append((r.json()["x"], r.json()["y"]))
+    assert positions == [(0.0, 0.0), (350.0, 0.0), (700.0, 0.0), (0.0, 250.0)]
+
+    response = await client.post("/api/workspace/notes", json={"km_note_id": "b", "content": "B"})
+    assert response.status_code == 400
@@ -1,9 +1,16 @@
+from functools import lru_cache
 from pathlib import Path
 
 
 def find_shared_dir(start_path: Path) -> Path:
     """Locate the shared/ directory by walking up from start_path."""
-    path = start_path.resolve()
+    return _find_shared_dir(str(start_path.resolve()))
+
+
+@lru_cache(maxsize=32)
+def _find_shared_dir(resolved: str) -> Path:
+    # The layout doesn't move at runtime, so each start path is walked once
+    path = Path(resolved)
     if path.is_file():
         path = path.parent
 
@@ -12,4 +19,4 @@ def find_shared_dir(start_path: Path) -> Path:
         if candidate.is_dir() and (candidate / "templates").is_dir():
             return candidate
 
-    raise RuntimeError(f"shared directory not found from {start_path}")
+    raise RuntimeError(f"shared directory not found from {resolved}")